@@ -1,11 +1,13 @@
-from .renard import (RenardSeriesKey, R5, R10, R20, R40, R80, series, series_keys,
+from .renard import (RenardSeriesKey, CustomSeriesKey, R5, R10, R20, R40, R80, series, series_keys,
                      find_greater_than_or_equal, find_greater_than, find_less_than_or_equal, find_less_than,
-                     find_nearest, find_nearest_few, rrange, open_rrange)
+                     find_nearest, find_nearest_few, rrange, open_rrange, RenardCursor, RenardValue,
+                     RenardValueArray, register_series, unregister_series)
 
 from .version import __version__
 
 __all__ = [
     'RenardSeriesKey',
+    'CustomSeriesKey',
     'R5',
     'R10',
     'R20',
@@ -21,4 +23,9 @@ __all__ = [
     'find_nearest_few',
     'rrange',
     'open_rrange',
+    'RenardCursor',
+    'RenardValue',
+    'RenardValueArray',
+    'register_series',
+    'unregister_series',
 ]
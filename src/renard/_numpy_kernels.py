@@ -0,0 +1,38 @@
+"""Lookup kernels over compiled tables, using NumPy.
+
+Each kernel takes a sorted table of series values and an array of query
+values, and returns an array of table indexes. Indexes of -1 or len(table)
+indicate that the result lies beyond the table.
+"""
+
+import numpy as np
+
+
+def greater_than_or_equal_indices(table, x):
+    return np.searchsorted(table, x, side='left')
+
+
+def greater_than_indices(table, x):
+    return np.searchsorted(table, x, side='right')
+
+
+def less_than_or_equal_indices(table, x):
+    return np.searchsorted(table, x, side='right') - 1
+
+
+def less_than_indices(table, x):
+    return np.searchsorted(table, x, side='left') - 1
+
+
+def nearest_indices(table, x):
+    upper = np.searchsorted(table, x, side='left')
+    lower = np.searchsorted(table, x, side='right') - 1
+    lower_values = table[np.maximum(lower, 0)]
+    upper_values = table[np.minimum(upper, len(table) - 1)]
+    nearest = np.where(x - lower_values <= upper_values - x, lower, upper)
+    # Values beyond either end of the table have no nearest value within it
+    return np.where(lower < 0, lower, np.where(upper >= len(table), upper, nearest))
+
+
+def count_in_range(table, start, stop):
+    return np.maximum(np.searchsorted(table, stop, side='right') - np.searchsorted(table, start, side='left'), 0)
@@ -0,0 +1,113 @@
+"""A frozen reference implementation of the Renard series lookups.
+
+This module is the oracle against which renard.differential checks the
+optimized engines. It deliberately does not share code with renard.renard
+beyond the base values of the series: series values are generated by the
+original range algorithm, which rounds each value with _round_sig(), and
+each lookup is answered by exhaustively searching the values generated in
+a window around the query value.
+
+Do not optimize this module. Its only virtue is being obviously correct.
+"""
+
+import math
+import sys
+from bisect import bisect_left, bisect_right
+from math import floor, log10
+
+from renard.renard import _MINIMUM_R_VALUE, series
+
+
+def find_greater_than_or_equal(series_key, value):
+    """The smallest series value greater-than or equal-to value."""
+    return min(_candidates_above(series_key, value, lambda v: v >= value))
+
+
+def find_greater_than(series_key, value):
+    """The smallest series value greater-than value."""
+    return min(_candidates_above(series_key, value, lambda v: v > value))
+
+
+def find_less_than_or_equal(series_key, value):
+    """The largest series value less-than or equal-to value."""
+    return max(_candidates_below(series_key, value, lambda v: v <= value))
+
+
+def find_less_than(series_key, value):
+    """The largest series value less-than value."""
+    return max(_candidates_below(series_key, value, lambda v: v < value))
+
+
+def find_nearest(series_key, value):
+    """The series value nearest to value, choosing the lower when equidistant."""
+    lower = find_less_than_or_equal(series_key, value)
+    try:
+        upper = find_greater_than_or_equal(series_key, value)
+    except ValueError:
+        # The next value is too large to be represented
+        upper = math.inf
+    return lower if value - lower <= upper - value else upper
+
+
+def rrange(series_key, start, stop):
+    """Generate the series values in the inclusive range start to stop."""
+    series_log = [log10(x) % 1 for x in series(series_key)]
+    cardinality = len(series_log)
+    epsilon = (series_log[-1] - series_log[-2]) / 2
+    start_decade, start_mantissa = _decade_mantissa(log10(start) - epsilon)
+    start_index = bisect_left(series_log, start_mantissa)
+    stop_decade, stop_mantissa = _decade_mantissa(log10(stop) + epsilon)
+    stop_index = bisect_right(series_log, stop_mantissa)
+    for step in range(start_decade * cardinality + start_index, stop_decade * cardinality + stop_index):
+        decade, index = divmod(step, cardinality)
+        try:
+            rounded_result = value_at(series_key, decade, index)
+        except OverflowError:
+            # Values too large to be represented
+            return
+        if start <= rounded_result <= stop:
+            yield rounded_result
+
+
+def value_at(series_key, decade, index):
+    """The series value for a base value index within a decade."""
+    series_values = series(series_key)
+    series_decade = int(log10(series_values[0]))
+    found = series_values[index]
+    scale_exponent = decade - series_decade
+    result = found * math.pow(10, scale_exponent)
+    return _round_sig(result, figures=series_decade + abs(floor(log10(series_key.precision))) + 1)
+
+
+def _candidates_above(series_key, value, predicate):
+    candidates = [v for v in _window(series_key, value) if predicate(v)]
+    if not candidates:
+        raise ValueError("There is no value above {}".format(value))
+    return candidates
+
+
+def _candidates_below(series_key, value, predicate):
+    candidates = [v for v in _window(series_key, value) if predicate(v)]
+    if not candidates:
+        raise ValueError("There is no value below {}".format(value))
+    return candidates
+
+
+def _window(series_key, value):
+    """All series values within two of the largest steps either side of value."""
+    if not math.isfinite(value):
+        raise ValueError("Value {} is not finite".format(value))
+    if value < _MINIMUM_R_VALUE:
+        raise ValueError("{} is too small. The value must greater than or equal to {}".format(value, _MINIMUM_R_VALUE))
+    base_values = series(series_key)
+    scale = max(b / a for a, b in zip(base_values, base_values[1:] + (10 * base_values[0],))) ** 2
+    return rrange(series_key, max(value / scale, _MINIMUM_R_VALUE), min(value * scale, sys.float_info.max))
+
+
+def _round_sig(x, figures=6):
+    return 0 if x == 0 else round(x, figures - floor(log10(abs(x))) - 1)
+
+
+def _decade_mantissa(value):
+    f_decade, mantissa = divmod(value, 1)
+    return int(f_decade), mantissa
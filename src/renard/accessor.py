@@ -0,0 +1,142 @@
+"""A pandas accessor for Renard series lookups.
+
+Importing this module registers a 'renard' accessor on pandas Series and
+DataFrames, which performs lookups with the batched functions in
+renard.vectorized:
+
+  >>> import pandas as pd
+  >>> import renard.accessor
+  >>> from renard import R20
+  >>> s = pd.Series([319.0, None, 37726.0])
+  >>> s.renard.nearest(R20)
+  0      315.0
+  1        NaN
+  2    35500.0
+  dtype: float64
+
+Missing values are passed through to the result rather than causing an
+error. Results keep the index and name of the original, and the nullable
+or Arrow-backed nature of its dtype.
+
+This module requires pandas, which can be installed with the pandas extra:
+
+  $ pip install renard[pandas]
+"""
+
+import numpy as np
+import pandas as pd
+
+from renard import vectorized
+from renard.eng import eng_string
+
+
+@pd.api.extensions.register_series_accessor('renard')
+class RenardSeriesAccessor:
+    """Renard series lookups for a pandas Series, available as Series.renard."""
+
+    def __init__(self, series):
+        self._series = series
+
+    def nearest(self, series_key):
+        """The nearest values in the Renard series."""
+        return self._lookup(vectorized.find_nearest, series_key)
+
+    def ge(self, series_key):
+        """The smallest values in the Renard series greater-than or equal-to each value."""
+        return self._lookup(vectorized.find_greater_than_or_equal, series_key)
+
+    def gt(self, series_key):
+        """The smallest values in the Renard series greater-than each value."""
+        return self._lookup(vectorized.find_greater_than, series_key)
+
+    def le(self, series_key):
+        """The largest values in the Renard series less-than or equal-to each value."""
+        return self._lookup(vectorized.find_less_than_or_equal, series_key)
+
+    def lt(self, series_key):
+        """The largest values in the Renard series less-than each value."""
+        return self._lookup(vectorized.find_less_than, series_key)
+
+    def index(self, series_key):
+        """The step indexes of the nearest values in the Renard series, as integers."""
+        x = self._values()
+        result, missing = vectorized._apply_skipping_nan(
+            vectorized.find_nearest_step, series_key, x, fill=0, dtype=np.int64)
+        if _is_arrow(self._series.dtype):
+            import pyarrow as pa
+            array = pd.arrays.ArrowExtensionArray(pa.array(result, mask=missing))
+        else:
+            array = pd.arrays.IntegerArray(result, missing)
+        return pd.Series(array, index=self._series.index, name=self._series.name)
+
+    def format(self, sig_figs=3, prefix=True):
+        """Format each value in engineering notation, as with renard.eng.eng_string().
+
+        Each distinct value is formatted only once, so formatting values which
+        have been snapped to a series is fast.
+        """
+        x = self._values()
+        uniques, inverse = np.unique(x, return_inverse=True)
+        texts = np.array([None if np.isnan(value) else eng_string(value, sig_figs=sig_figs, prefix=prefix)
+                          for value in uniques.tolist()], dtype=object)
+        return pd.Series(texts[inverse.reshape(x.shape)], index=self._series.index, name=self._series.name)
+
+    def _values(self):
+        return self._series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    def _lookup(self, func, series_key):
+        result, missing = vectorized._apply_skipping_nan(func, series_key, self._values())
+        dtype = self._series.dtype
+        if _is_arrow(dtype):
+            import pyarrow as pa
+            array = pd.arrays.ArrowExtensionArray(pa.array(result, mask=self._series.isna().to_numpy()))
+        elif isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            array = pd.arrays.FloatingArray(result, self._series.isna().to_numpy())
+        else:
+            array = result
+        return pd.Series(array, index=self._series.index, name=self._series.name)
+
+
+@pd.api.extensions.register_dataframe_accessor('renard')
+class RenardDataFrameAccessor:
+    """Renard series lookups for the columns of a pandas DataFrame, available as DataFrame.renard."""
+
+    def __init__(self, frame):
+        self._frame = frame
+
+    def nearest(self, series_key, columns=None):
+        """Replace the values in the given, or all numeric, columns with the nearest values."""
+        return self._apply('nearest', series_key, columns)
+
+    def ge(self, series_key, columns=None):
+        """Replace the values in the given, or all numeric, columns with the next greater-or-equal values."""
+        return self._apply('ge', series_key, columns)
+
+    def gt(self, series_key, columns=None):
+        """Replace the values in the given, or all numeric, columns with the next greater values."""
+        return self._apply('gt', series_key, columns)
+
+    def le(self, series_key, columns=None):
+        """Replace the values in the given, or all numeric, columns with the next lesser-or-equal values."""
+        return self._apply('le', series_key, columns)
+
+    def lt(self, series_key, columns=None):
+        """Replace the values in the given, or all numeric, columns with the next lesser values."""
+        return self._apply('lt', series_key, columns)
+
+    def index(self, series_key, columns=None):
+        """Replace the values in the given, or all numeric, columns with the step indexes of the nearest values."""
+        return self._apply('index', series_key, columns)
+
+    def _apply(self, method, series_key, columns):
+        if columns is None:
+            columns = self._frame.select_dtypes(include='number').columns
+        result = self._frame.copy()
+        for column in columns:
+            result[column] = getattr(self._frame[column].renard, method)(series_key)
+        return result
+
+
+def _is_arrow(dtype):
+    # ArrowDtype is not available in older versions of pandas
+    return isinstance(dtype, getattr(pd, 'ArrowDtype', ()))
@@ -0,0 +1,258 @@
+"""Lookups and ranges for use from asyncio.
+
+The coroutines in this module correspond to the batched functions in
+renard.vectorized, and the asynchronous generator rrange() to the function
+of the same name in renard.renard, but they avoid blocking the event loop:
+
+  >>> from renard import R20, aio
+  >>> nearest = await aio.nearest_many(R20, readings)
+  >>> async for value in aio.rrange(R20, 1e-9, 1e9):
+  ...     print(value)
+
+Large requests are split into chunks, each of which is handed off to an
+executor, so the event loop can run other tasks between chunks. The
+executor is the event loop's default executor unless another is given.
+Requests no larger than one chunk are served inline, without the overhead
+of the executor, and the chunk sizes are chosen so that serving a chunk
+takes no more than a few milliseconds.
+
+Cancelling a task which is awaiting a lookup or iterating over a range
+stops the work at the end of the current chunk. The chunk being served by
+the executor runs to completion, but its result is discarded. A range
+which is cancelled, or closed before it is exhausted, waits for any chunk
+being generated before it closes the underlying generator.
+
+This module requires NumPy, which can be installed with the numpy extra:
+
+  $ pip install renard[numpy]
+"""
+
+import asyncio
+from itertools import islice
+
+import numpy as np
+
+from renard import renard, vectorized
+from renard.tables import compiled_table
+
+DEFAULT_CHUNK_SIZE = 16384
+
+DEFAULT_RANGE_CHUNK_SIZE = 1024
+
+
+async def nearest_many(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the nearest values, without blocking the event loop.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the default executor of the event loop.
+        chunk_size: The number of query values looked up at once. Arrays
+            no larger than this are looked up inline.
+
+    Returns:
+        An array of the values from the specified series closest to the
+        query values, with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return await _offload(vectorized.find_nearest, series_key, values, executor, chunk_size)
+
+
+async def greater_than_or_equal_many(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the smallest values greater-than or equal-to the given values, without blocking the event loop.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the default executor of the event loop.
+        chunk_size: The number of query values looked up at once.
+
+    Returns:
+        An array of values with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return await _offload(vectorized.find_greater_than_or_equal, series_key, values, executor, chunk_size)
+
+
+async def greater_than_many(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the smallest values greater-than the given values, without blocking the event loop.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the default executor of the event loop.
+        chunk_size: The number of query values looked up at once.
+
+    Returns:
+        An array of values with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return await _offload(vectorized.find_greater_than, series_key, values, executor, chunk_size)
+
+
+async def less_than_or_equal_many(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the largest values less-than or equal-to the given values, without blocking the event loop.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the default executor of the event loop.
+        chunk_size: The number of query values looked up at once.
+
+    Returns:
+        An array of values with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return await _offload(vectorized.find_less_than_or_equal, series_key, values, executor, chunk_size)
+
+
+async def less_than_many(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the largest values less-than the given values, without blocking the event loop.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the default executor of the event loop.
+        chunk_size: The number of query values looked up at once.
+
+    Returns:
+        An array of values with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return await _offload(vectorized.find_less_than, series_key, values, executor, chunk_size)
+
+
+async def nearest_step_many(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the step indexes of the nearest values, without blocking the event loop.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the default executor of the event loop.
+        chunk_size: The number of query values looked up at once.
+
+    Returns:
+        An integer array of step indexes with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return await _offload(vectorized.find_nearest_step, series_key, values, executor, chunk_size, dtype=np.int64)
+
+
+def rrange(series_key, start, stop, reverse=False, exact=False, executor=None, chunk_size=DEFAULT_RANGE_CHUNK_SIZE):
+    """Generate Renard values in a range inclusive of the start and stop values, without blocking the event loop.
+
+    The arguments are checked when this function is called, rather than
+    when iteration begins.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        start: The beginning of the range. The yielded values may include this value.
+        stop: The end of the range. The yielded values may include this value.
+        reverse: If True, yield the values from highest to lowest.
+        exact: If True, yield RenardValues rather than floats.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the default executor of the event loop.
+        chunk_size: The number of values generated at once. Ranges of no
+            more than this many values are generated inline.
+
+    Returns:
+        An asynchronous iterator over the values from the specified range,
+        as yielded by renard.rrange().
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If start is not less-than or equal-to stop.
+        ValueError: If start or stop are not both finite.
+        ValueError: If start or stop are out of range.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size {} is not positive".format(chunk_size))
+    values = renard.rrange(series_key, start, stop, reverse=reverse, exact=exact)
+    first_step, last_step = renard._step_bounds(series_key, start, stop)
+    return _arange(values, last_step - first_step + 1 <= chunk_size, executor, chunk_size)
+
+
+async def _offload(batch_func, series_key, values, executor, chunk_size, dtype=np.float64):
+    if chunk_size < 1:
+        raise ValueError("Chunk size {} is not positive".format(chunk_size))
+    x = np.asarray(values, dtype=np.float64)
+    if x.size <= chunk_size:
+        return batch_func(series_key, x)
+    loop = asyncio.get_running_loop()
+    # Validate the series key, and compile its table if necessary, off the event loop
+    await loop.run_in_executor(executor, compiled_table, series_key)
+    flat = np.ravel(x)
+    result = np.empty(flat.shape, dtype=dtype)
+    for start in range(0, len(flat), chunk_size):
+        stop = start + chunk_size
+        result[start:stop] = await loop.run_in_executor(executor, batch_func, series_key, flat[start:stop])
+    return result.reshape(x.shape)
+
+
+async def _arange(values, inline, executor, chunk_size):
+    if inline:
+        try:
+            for value in values:
+                yield value
+        finally:
+            values.close()
+        return
+    loop = asyncio.get_running_loop()
+    # The generator is advanced by at most one executor thread at a time, and
+    # is closed on the event loop only once no chunk is being taken from it
+    pending = None
+    try:
+        while True:
+            pending = loop.run_in_executor(executor, _take, values, chunk_size)
+            # Shielded, so that if this task is cancelled the chunk can still be awaited below
+            chunk = await asyncio.shield(pending)
+            pending = None
+            for value in chunk:
+                yield value
+            if len(chunk) < chunk_size:
+                return
+    finally:
+        if pending is not None:
+            await asyncio.wait({pending})
+        values.close()
+
+
+def _take(iterator, count):
+    return list(islice(iterator, count))
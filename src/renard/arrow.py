@@ -0,0 +1,143 @@
+"""Lookups over Apache Arrow arrays.
+
+The functions in this module correspond to those of the same names in
+renard.vectorized, but accept and return pyarrow Arrays or ChunkedArrays.
+Values are passed between Arrow and NumPy as buffers, never as Python
+objects. Null and NaN values are passed through to the result rather than
+causing an error.
+
+This module requires PyArrow, which can be installed with the arrow extra:
+
+  $ pip install renard[arrow]
+"""
+
+import numpy as np
+import pyarrow as pa
+
+from renard import vectorized
+
+
+def find_nearest(series_key, array):
+    """Find the nearest values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        array: A pyarrow Array or ChunkedArray of numbers.
+
+    Returns:
+        A float64 array of the same kind as array, containing the values from
+        the specified series closest to the query values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is infinite.
+        ValueError: If any value is out of range.
+    """
+    return _map(vectorized.find_nearest, series_key, array)
+
+
+def find_greater_than_or_equal(series_key, array):
+    """Find the smallest values greater-than or equal-to the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        array: A pyarrow Array or ChunkedArray of numbers.
+
+    Returns:
+        A float64 array of the same kind as array.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is infinite.
+        ValueError: If any value is out of range.
+    """
+    return _map(vectorized.find_greater_than_or_equal, series_key, array)
+
+
+def find_greater_than(series_key, array):
+    """Find the smallest values greater-than the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        array: A pyarrow Array or ChunkedArray of numbers.
+
+    Returns:
+        A float64 array of the same kind as array.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is infinite.
+        ValueError: If any value is out of range.
+    """
+    return _map(vectorized.find_greater_than, series_key, array)
+
+
+def find_less_than_or_equal(series_key, array):
+    """Find the largest values less-than or equal-to the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        array: A pyarrow Array or ChunkedArray of numbers.
+
+    Returns:
+        A float64 array of the same kind as array.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is infinite.
+        ValueError: If any value is out of range.
+    """
+    return _map(vectorized.find_less_than_or_equal, series_key, array)
+
+
+def find_less_than(series_key, array):
+    """Find the largest values less-than the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        array: A pyarrow Array or ChunkedArray of numbers.
+
+    Returns:
+        A float64 array of the same kind as array.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is infinite.
+        ValueError: If any value is out of range.
+    """
+    return _map(vectorized.find_less_than, series_key, array)
+
+
+def find_nearest_step(series_key, array):
+    """Find the step indexes of the nearest values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        array: A pyarrow Array or ChunkedArray of numbers.
+
+    Returns:
+        An int64 array of the same kind as array, with nulls in place of
+        null or NaN values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is infinite.
+        ValueError: If any value is out of range.
+    """
+    return _map(vectorized.find_nearest_step, series_key, array, pa.int64())
+
+
+def _map(func, series_key, array, result_type=pa.float64()):
+    if isinstance(array, pa.ChunkedArray):
+        return pa.chunked_array([_map_array(func, series_key, chunk, result_type) for chunk in array.chunks],
+                                type=result_type)
+    return _map_array(func, series_key, array, result_type)
+
+
+def _map_array(func, series_key, array, result_type):
+    x = array.cast(pa.float64()).to_numpy(zero_copy_only=False)
+    if result_type == pa.float64():
+        result, _ = vectorized._apply_skipping_nan(func, series_key, x)
+        return pa.array(result, mask=array.is_null().to_numpy(zero_copy_only=False), type=result_type)
+    result, missing = vectorized._apply_skipping_nan(func, series_key, x, fill=0, dtype=np.int64)
+    return pa.array(result, mask=missing, type=result_type)
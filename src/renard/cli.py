@@ -1,15 +1,21 @@
 """The command-line for renard"""
 
+import csv
 import os
+import struct
 import sys
+from array import array
+from itertools import islice
 
 import docopt
 import docopt_subcommands as dsc
 
 from renard.eng import eng_string
+from renard.instrument import instrumented
 from renard.version import __version__
 from renard.renard import (series_key_from_name, find_nearest, find_nearest_few, find_greater_than_or_equal,
-                           find_greater_than, find_less_than, find_less_than_or_equal, series, rrange, precision)
+                           find_greater_than, find_less_than, find_less_than_or_equal, series, rrange, precision,
+                           _range_steps)
 
 DOC_TEMPLATE = """{program}
 
@@ -27,6 +33,7 @@ See '{program} help <command>' for help on specific commands.
 
 
 @dsc.command()
+@instrumented()
 def handle_nearest(precommand, args):
     """usage: {program} nearest <Renard-series> <value> [--symbol]
 
@@ -44,6 +51,7 @@ def handle_nearest(precommand, args):
 
 
 @dsc.command()
+@instrumented()
 def handle_nearby(precommand, args):
     """usage: {program} nearby <Renard-series> <value> [--symbol]
 
@@ -64,6 +72,7 @@ def handle_nearby(precommand, args):
 
 
 @dsc.command()
+@instrumented()
 def handle_gt(precommand, args):
     """usage: {program} gt <Renard-series> <value> [--symbol]
 
@@ -81,6 +90,7 @@ def handle_gt(precommand, args):
 
 
 @dsc.command()
+@instrumented()
 def handle_ge(precommand, args):
     """usage: {program} ge <Renard-series> <value> [--symbol]
 
@@ -98,6 +108,7 @@ def handle_ge(precommand, args):
 
 
 @dsc.command()
+@instrumented()
 def handle_lt(precommand, args):
     """usage: {program} lt <Renard-series> <value> [--symbol]
 
@@ -115,6 +126,7 @@ def handle_lt(precommand, args):
 
 
 @dsc.command()
+@instrumented()
 def handle_le(precommand, args):
     """usage: {program} le <Renard-series> <value> [--symbol]
 
@@ -132,6 +144,7 @@ def handle_le(precommand, args):
 
 
 @dsc.command()
+@instrumented()
 def handle_series(precommand, args):
     """usage: {program} series <Renard-series>
 
@@ -144,25 +157,83 @@ def handle_series(precommand, args):
 
 
 @dsc.command()
+@instrumented()
 def handle_range(precommand, args):
-    """usage: {program} range <Renard-series> <start-value> <stop-value> [--symbol]
+    """usage: {program} range <Renard-series> <start-value> <stop-value> [--symbol] [--format=<format>]
 
     All values in the given Renard series from start-value to stop-value inclusive.
 
+    The text format gives one value per line in engineering notation. The
+    json format gives an array of numbers, and the csv format a column of
+    numbers headed 'value'. The npy format gives a NumPy array file, and
+    the raw format little-endian 64-bit floats with no header.
+
     Options:
-      -s --symbol  Use the SI magnitude prefix symbol.
+      -s --symbol             Use the SI magnitude prefix symbol with the text format.
+      -f --format=<format>    One of text, json, csv, npy or raw [default: text].
     """
     series_key = extract_series_key(args)
     start_value = extract_value(args, '<start-value>')
     stop_value = extract_value(args, '<stop-value>')
-    items = rrange(series_key, start_value, stop_value)
-    for item in items:
-        item_text = present_value(args, item)
-        print(item_text)
+    output_format = args['--format'] or 'text'
+    try:
+        writer = RANGE_WRITERS[output_format]
+    except KeyError:
+        raise ValueError("Format {!r} is not one of {}".format(output_format, ', '.join(RANGE_WRITERS)))
+    writer(args, series_key, start_value, stop_value)
+    return os.EX_OK
+
+
+@dsc.command()
+@instrumented()
+def handle_map(precommand, args):
+    """usage: {program} map <Renard-series> <column>... [--mode=<mode>] [--in-place | --suffix=<suffix>] [--input=<file>] [--chunk-size=<rows>]
+
+    Snap the values in one or more columns of a CSV file to an Renard series.
+
+    The CSV file, which must have a header row, is read from standard input
+    or the given file, and written to standard output. Each named column is
+    snapped using the mode, which is one of nearest, ge, gt, le or lt, and
+    the result is written to a new column after the last, named by adding
+    the suffix to the name of the column, or in place of the original
+    values. Empty cells are left empty. The file is processed a chunk of
+    rows at a time, so files of any size can be mapped. This command
+    requires NumPy.
+
+    Options:
+      -m --mode=<mode>          One of nearest, ge, gt, le or lt [default: nearest].
+      -i --in-place             Replace the values in each column.
+      --suffix=<suffix>         The suffix for the names of new columns, by default an
+                                underscore and the name of the series.
+      --input=<file>            The CSV file to read [default: -].
+      --chunk-size=<rows>       The number of rows to process at a time [default: 4096].
+    """
+    series_key = extract_series_key(args)
+    try:
+        from renard import vectorized
+    except ImportError as exc:
+        print("The map command requires NumPy: {}".format(exc), file=sys.stderr)
+        return os.EX_UNAVAILABLE
+    mode = args['--mode'] or 'nearest'
+    try:
+        finder = getattr(vectorized, MAP_FINDERS[mode])
+    except KeyError:
+        raise ValueError("Mode {!r} is not one of {}".format(mode, ', '.join(MAP_FINDERS)))
+    chunk_size = extract_chunk_size(args)
+    suffix = args['--suffix']
+    if suffix is None:
+        suffix = '_' + args['<Renard-series>']
+    filename = args['--input'] or '-'
+    if filename == '-':
+        map_csv(finder, series_key, sys.stdin, args['<column>'], args['--in-place'], suffix, chunk_size)
+    else:
+        with open(filename, newline='') as infile:
+            map_csv(finder, series_key, infile, args['<column>'], args['--in-place'], suffix, chunk_size)
     return os.EX_OK
 
 
 @dsc.command()
+@instrumented()
 def handle_precision(precommand, args):
     """usage: {program} precision <Renard-series>
 
@@ -174,6 +245,139 @@ def handle_precision(precommand, args):
     return os.EX_OK
 
 
+def write_text(args, series_key, start_value, stop_value):
+    for chunk in _chunks(rrange(series_key, start_value, stop_value)):
+        sys.stdout.write(''.join(present_value(args, item) + '\n' for item in chunk))
+
+
+def write_json(args, series_key, start_value, stop_value):
+    # rrange() validates its arguments immediately, so nothing is written for an invalid range
+    values = rrange(series_key, start_value, stop_value)
+    separator = ''
+    sys.stdout.write('[')
+    for chunk in _chunks(values):
+        sys.stdout.write(separator + ', '.join(map(repr, chunk)))
+        separator = ', '
+    sys.stdout.write(']\n')
+
+
+def write_csv(args, series_key, start_value, stop_value):
+    values = rrange(series_key, start_value, stop_value)
+    sys.stdout.write('value\n')
+    for chunk in _chunks(values):
+        sys.stdout.write(''.join(repr(item) + '\n' for item in chunk))
+
+
+def write_npy(args, series_key, start_value, stop_value):
+    # The shape must precede the data, so the values are counted from the step bounds of the range
+    count = len(_range_steps(series_key, start_value, stop_value))
+    header = "{{'descr': '<f8', 'fortran_order': False, 'shape': ({},), }}".format(count)
+    # The magic string, version, header length and header are padded to a multiple of 64 bytes
+    padding = -(len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = (header + ' ' * padding + '\n').encode('latin1')
+    _write_binary(_NPY_MAGIC + struct.pack('<H', len(header)) + header,
+                  _chunks(rrange(series_key, start_value, stop_value)))
+
+
+def write_raw(args, series_key, start_value, stop_value):
+    _write_binary(b'', _chunks(rrange(series_key, start_value, stop_value)))
+
+
+def _write_binary(preamble, chunks):
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    out.write(preamble)
+    for chunk in chunks:
+        if sys.byteorder != 'little':  # pragma: no cover
+            chunk.byteswap()
+        out.write(chunk.tobytes())
+    out.flush()
+
+
+def _chunks(items, size=4096):
+    """Gather items into arrays of at most size floats."""
+    items = iter(items)
+    while True:
+        chunk = array('d', islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+_NPY_MAGIC = b'\x93NUMPY\x01\x00'
+
+MAP_FINDERS = {
+    'nearest': 'find_nearest',
+    'ge': 'find_greater_than_or_equal',
+    'gt': 'find_greater_than',
+    'le': 'find_less_than_or_equal',
+    'lt': 'find_less_than',
+}
+
+RANGE_WRITERS = {
+    'text': write_text,
+    'json': write_json,
+    'csv': write_csv,
+    'npy': write_npy,
+    'raw': write_raw,
+}
+
+
+def map_csv(finder, series_key, infile, columns, in_place, suffix, chunk_size):
+    """Stream CSV rows from infile to standard output, snapping columns with a batched finder."""
+    reader = csv.reader(infile)
+    writer = csv.writer(sys.stdout, lineterminator='\n')
+    try:
+        header = next(reader)
+    except StopIteration:
+        return
+    indexes = []
+    for column in columns:
+        try:
+            indexes.append(header.index(column))
+        except ValueError:
+            raise ValueError("There is no column {!r} in {}".format(column, ', '.join(map(repr, header))))
+    writer.writerow(header if in_place else header + [column + suffix for column in columns])
+    row_number = 1
+    while True:
+        rows = list(islice(reader, chunk_size))
+        if not rows:
+            return
+        mapped = [_map_column(finder, series_key, rows, index, row_number) for index in indexes]
+        if in_place:
+            for index, cells in zip(indexes, mapped):
+                for row, cell in zip(rows, cells):
+                    row[index] = cell
+        else:
+            for row, *cells in zip(rows, *mapped):
+                row.extend(cells)
+        writer.writerows(rows)
+        row_number += len(rows)
+
+
+def _map_column(finder, series_key, rows, index, first_row_number):
+    cells = [''] * len(rows)
+    positions = []
+    values = array('d')
+    for position, row in enumerate(rows):
+        try:
+            text = row[index].strip()
+        except IndexError:
+            raise ValueError("Row {} has no column {}".format(first_row_number + position, index + 1))
+        if not text:
+            continue
+        try:
+            values.append(float(text))
+        except ValueError:
+            raise ValueError("{!r} in row {} could not be interpreted as a number".format(
+                text, first_row_number + position))
+        positions.append(position)
+    if positions:
+        for position, result in zip(positions, finder(series_key, values).tolist()):
+            cells[position] = repr(result)
+    return cells
+
+
 def present_value(args, nearest):
     return eng_string(nearest, prefix=args['--symbol'])
 
@@ -184,6 +388,17 @@ def extract_series_key(args):
     return series_key
 
 
+def extract_chunk_size(args):
+    text_value = args['--chunk-size'] or '4096'
+    try:
+        chunk_size = int(text_value)
+    except ValueError:
+        raise ValueError("{!r} could not be interpreted as a chunk size".format(text_value))
+    if chunk_size < 1:
+        raise ValueError("Chunk size {} is not positive".format(chunk_size))
+    return chunk_size
+
+
 def extract_value(args, name='<value>'):
     text_value = args[name]
     try:
@@ -0,0 +1,213 @@
+"""Approximating values with two Renard values in series or in parallel.
+
+A value which is not in a series can often be approximated closely by
+combining two values which are, either in series, as a + b, or in
+parallel, as 1 / (1/a + 1/b):
+
+  >>> from renard import R10
+  >>> from renard.combinations import find_combinations
+  >>> find_combinations(R10, 4700, kind='series', num=2)
+  [Combination(a=1600.0, b=3150.0, kind='series', value=4750.0, error=0.010638297872340425),
+   Combination(a=630.0, b=4000.0, kind='series', value=4630.0, error=-0.014893617021276596)]
+
+The search takes the values within a range from the compiled tables in
+renard.tables, which are already sorted. For each value a, a single
+two-pointer sweep finds where the partner b crosses the target. The
+candidate partners either side of each crossing are merged through a
+heap, so the best k combinations are found in O(m + k log m) time for m
+values, rather than the O(m²) of comparing every pair. A
+CombinationSearch can be reused for many targets, sharing the selected
+values between them.
+"""
+
+import heapq
+import math
+import numbers
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+from renard.tables import compiled_table
+
+KINDS = ('series', 'parallel')
+
+DEFAULT_SPAN = 100
+
+Combination = namedtuple('Combination', ['a', 'b', 'kind', 'value', 'error'])
+Combination.__doc__ = """Two series values a <= b, their combined value, and its relative error from the target."""
+
+
+class CombinationSearch:
+    """A search for combinations of two values from a series within a range.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        start: The smallest value which may be combined.
+        stop: The largest value which may be combined.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If start is not less-than or equal-to stop.
+        ValueError: If the range contains no values.
+    """
+
+    def __init__(self, series_key, start, stop):
+        if not start <= stop:
+            raise ValueError("Start value {} must be less than stop value {}".format(start, stop))
+        table = compiled_table(series_key).values
+        values = table[bisect_left(table, start):bisect_right(table, stop)].tolist()
+        values = [value for value in values if value < math.inf]
+        if not values:
+            raise ValueError("There are no values in the range {} to {}".format(start, stop))
+        self._series_key = series_key
+        self._values = values
+        # In parallel, conductances add, so the parallel search is a series search over conductances
+        self._reversed_values = values[::-1]
+        self._conductances = [1 / value for value in self._reversed_values]
+
+    @property
+    def series_key(self):
+        return self._series_key
+
+    @property
+    def values(self):
+        """The values which may be combined, from lowest to highest."""
+        return tuple(self._values)
+
+    def find(self, target, kind='series', num=1):
+        """Find the combinations closest to a target.
+
+        Args:
+            target: The value to be approximated.
+            kind: 'series' to combine values as a + b, or 'parallel' to
+                combine them as 1 / (1/a + 1/b).
+            num: The number of combinations to find.
+
+        Returns:
+            A list of up to num Combinations, from the smallest to the
+            largest absolute relative error.
+
+        Raises:
+            ValueError: If target is not finite and positive.
+            ValueError: If kind is not 'series' or 'parallel'.
+            ValueError: If num is not a positive integer.
+        """
+        _check_target(target)
+        _check_arguments(kind, num)
+        return self._find(target, kind, num)
+
+    def find_many(self, targets, kind='series', num=1):
+        """Find the combinations closest to each of many targets.
+
+        Args:
+            targets: An iterable of values to be approximated.
+            kind: 'series' or 'parallel'.
+            num: The number of combinations to find for each target.
+
+        Returns:
+            A list containing a list of Combinations for each target, as
+            returned by find().
+
+        Raises:
+            ValueError: If any target is not finite and positive.
+            ValueError: If kind is not 'series' or 'parallel'.
+            ValueError: If num is not a positive integer.
+        """
+        _check_arguments(kind, num)
+        targets = list(targets)
+        for target in targets:
+            _check_target(target)
+        return [self._find(target, kind, num) for target in targets]
+
+    def _find(self, target, kind, num):
+        if kind == 'series':
+            values = self._values
+            pairs = _best_pairs(values, target, num, lambda i, j: values[i] + values[j] - target)
+            return [_combination(values[i], values[j], kind, target) for i, j in pairs]
+        # The conductances ascend, so the pair (i, j) is of the values reversed[j] <= reversed[i]
+        reversed_values = self._reversed_values
+        pairs = _best_pairs(self._conductances, 1 / target, num,
+                            lambda i, j: _parallel_value(reversed_values[i], reversed_values[j]) - target)
+        return [_combination(reversed_values[j], reversed_values[i], kind, target) for i, j in pairs]
+
+    def __repr__(self):
+        return "{}({!r}, {!r}, {!r})".format(type(self).__name__, self._series_key, self._values[0], self._values[-1])
+
+
+def find_combinations(series_key, target, kind='series', num=1, span=DEFAULT_SPAN):
+    """Find the combinations of two series values closest to a target.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        target: The value to be approximated.
+        kind: 'series' to combine values as a + b, or 'parallel' to
+            combine them as 1 / (1/a + 1/b).
+        num: The number of combinations to find.
+        span: The values combined lie between target / span and
+            target * span.
+
+    Returns:
+        A list of up to num Combinations, from the smallest to the largest
+        absolute relative error.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If target is not finite and positive.
+        ValueError: If kind is not 'series' or 'parallel'.
+        ValueError: If num is not a positive integer.
+        ValueError: If span is less than one.
+    """
+    _check_target(target)
+    if not span >= 1:
+        raise ValueError("Span {} is not at least one".format(span))
+    return CombinationSearch(series_key, target / span, target * span).find(target, kind, num)
+
+
+def _best_pairs(xs, target_sum, num, error):
+    """The index pairs (i, j), i <= j, for which xs[i] + xs[j] gives the num smallest errors.
+
+    The error must grow with the distance of xs[i] + xs[j] from target_sum.
+    """
+    m = len(xs)
+    # For each i, the partners j >= i form two rays running away from the
+    # crossing of target_sum, along which the error only grows.
+    heap = []
+    j = m - 1
+    for i in range(m):
+        while j >= 0 and xs[i] + xs[j] > target_sum:
+            j -= 1
+        if j >= i:
+            heap.append((abs(error(i, j)), i, j, -1))
+        upper = max(j + 1, i)
+        if upper < m:
+            heap.append((abs(error(i, upper)), i, upper, +1))
+    heapq.heapify(heap)
+    pairs = []
+    while heap and len(pairs) < num:
+        _, i, j, step = heapq.heappop(heap)
+        pairs.append((i, j))
+        following = j + step
+        if i <= following < m:
+            heapq.heappush(heap, (abs(error(i, following)), i, following, step))
+    return pairs
+
+
+def _parallel_value(a, b):
+    # Unlike a * b / (a + b), this doesn't underflow for small values
+    return 1 / (1 / a + 1 / b)
+
+
+def _combination(a, b, kind, target):
+    value = a + b if kind == 'series' else _parallel_value(a, b)
+    return Combination(a, b, kind, value, (value - target) / target)
+
+
+def _check_target(target):
+    if not (math.isfinite(target) and target > 0):
+        raise ValueError("Target {} is not finite and positive".format(target))
+
+
+def _check_arguments(kind, num):
+    if kind not in KINDS:
+        raise ValueError("Kind {!r} is not one of {}".format(kind, ', '.join(map(repr, KINDS))))
+    if not isinstance(num, numbers.Integral) or num < 1:
+        raise ValueError("num {} is not a positive integer".format(num))
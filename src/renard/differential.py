@@ -0,0 +1,382 @@
+"""Differential testing of lookup engines against a frozen reference.
+
+An engine is any object with one or more batched lookup methods named as
+in OPERATIONS, each of which accepts a series key and a one-dimensional
+array of query values and returns a sequence of results. The results of
+each registered engine are compared with those of the frozen reference
+implementation in renard._reference, and the time each takes is recorded:
+
+  >>> from renard.differential import compare, decade_edge_values
+  >>> from renard import R80
+  >>> report = compare(decade_edge_values(R80, decades=[0]), series_keys=[R80])
+  >>> report.mismatches
+  []
+
+The 'scalar' engine, which uses the functions in renard.renard, is always
+registered. The 'numpy' and 'numba' engines, which use renard.vectorized
+with the corresponding backend, are registered when available. Further
+engines can be registered with register_engine().
+
+A full comparison of all registered engines over all series can be run
+from the command line, which prints a report of any mismatches and of the
+speedup of each engine relative to the reference:
+
+  $ python -m renard.differential
+
+This module requires NumPy, which can be installed with the numpy extra:
+
+  $ pip install renard[numpy]
+"""
+
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from renard import _reference, renard, vectorized
+from renard.renard import _MINIMUM_R_VALUE, RenardSeriesKey, series
+
+OPERATIONS = (
+    'find_nearest',
+    'find_greater_than_or_equal',
+    'find_greater_than',
+    'find_less_than_or_equal',
+    'find_less_than',
+)
+
+DEFAULT_DECADES = (-200, -199, -101, -100, -2, -1, 0, 1, 2, 3, 99, 100, 306, 307, 308)
+
+Mismatch = namedtuple('Mismatch', ['engine', 'series_key', 'operation', 'value', 'expected', 'actual'])
+
+
+class Timing(namedtuple('Timing', ['engine', 'operation', 'count', 'reference_time', 'engine_time'])):
+    """The time taken by the reference and by an engine for the same lookups."""
+
+    __slots__ = ()
+
+    @property
+    def speedup(self):
+        """The reference time divided by the engine time."""
+        return self.reference_time / self.engine_time if self.engine_time > 0 else float('inf')
+
+
+class DifferentialReport:
+    """The mismatches and timings from a differential comparison."""
+
+    def __init__(self, mismatches, timings):
+        self.mismatches = mismatches
+        self.timings = timings
+
+    @property
+    def ok(self):
+        """True if no engine disagreed with the reference."""
+        return not self.mismatches
+
+    def speedup(self, engine, operation=None):
+        """The overall speedup of an engine relative to the reference.
+
+        Args:
+            engine: The name of a registered engine.
+            operation: An optional operation name from OPERATIONS. If None,
+                the timings of all operations are combined.
+
+        Raises:
+            ValueError: If there are no timings for the engine and operation.
+        """
+        timings = [t for t in self.timings
+                   if t.engine == engine and (operation is None or t.operation == operation)]
+        if not timings:
+            raise ValueError("There are no timings for engine {!r}".format(engine))
+        return Timing(engine, operation, sum(t.count for t in timings),
+                      sum(t.reference_time for t in timings),
+                      sum(t.engine_time for t in timings)).speedup
+
+    def __str__(self):
+        lines = ["{:<12} {:<28} {:>9} {:>9}".format('engine', 'operation', 'lookups', 'speedup')]
+        for timing in self.timings:
+            lines.append("{:<12} {:<28} {:>9} {:>8.1f}x".format(
+                timing.engine, timing.operation, timing.count, timing.speedup))
+        lines.append("{} mismatches".format(len(self.mismatches)))
+        for mismatch in self.mismatches[:20]:
+            lines.append("{m.engine} {m.series_key.name} {m.operation}({m.value!r}): "
+                         "expected {m.expected!r}, got {m.actual!r}".format(m=mismatch))
+        return '\n'.join(lines)
+
+
+class ScalarEngine:
+    """An engine which applies the scalar functions of renard.renard to each value."""
+
+    def find_nearest(self, series_key, values):
+        return [renard.find_nearest(series_key, value) for value in values.tolist()]
+
+    def find_greater_than_or_equal(self, series_key, values):
+        return [renard.find_greater_than_or_equal(series_key, value) for value in values.tolist()]
+
+    def find_greater_than(self, series_key, values):
+        return [renard.find_greater_than(series_key, value) for value in values.tolist()]
+
+    def find_less_than_or_equal(self, series_key, values):
+        return [renard.find_less_than_or_equal(series_key, value) for value in values.tolist()]
+
+    def find_less_than(self, series_key, values):
+        return [renard.find_less_than(series_key, value) for value in values.tolist()]
+
+
+class VectorizedEngine:
+    """An engine which uses the batched functions of renard.vectorized with a given backend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def find_nearest(self, series_key, values):
+        return self._call(vectorized.find_nearest, series_key, values)
+
+    def find_greater_than_or_equal(self, series_key, values):
+        return self._call(vectorized.find_greater_than_or_equal, series_key, values)
+
+    def find_greater_than(self, series_key, values):
+        return self._call(vectorized.find_greater_than, series_key, values)
+
+    def find_less_than_or_equal(self, series_key, values):
+        return self._call(vectorized.find_less_than_or_equal, series_key, values)
+
+    def find_less_than(self, series_key, values):
+        return self._call(vectorized.find_less_than, series_key, values)
+
+    def _call(self, func, series_key, values):
+        previous = vectorized.get_backend()
+        vectorized.set_backend(self.backend)
+        try:
+            return func(series_key, values)
+        finally:
+            vectorized.set_backend(previous)
+
+
+_engines = {'scalar': ScalarEngine()}
+for _backend in vectorized.available_backends():
+    _engines[_backend] = VectorizedEngine(_backend)
+
+
+def register_engine(name, engine):
+    """Register an engine to be compared with the reference.
+
+    Args:
+        name: The name of the engine, which replaces any engine already
+            registered with that name.
+        engine: An object with batched lookup methods named as in OPERATIONS.
+    """
+    _engines[name] = engine
+
+
+def unregister_engine(name):
+    """Remove a registered engine.
+
+    Raises:
+        ValueError: If no engine is registered with the name.
+    """
+    try:
+        del _engines[name]
+    except KeyError:
+        raise ValueError("Engine {!r} is not registered".format(name))
+
+
+def engines():
+    """A dictionary of the registered engines, keyed by name."""
+    return dict(_engines)
+
+
+def decade_edge_values(series_key, decades=DEFAULT_DECADES):
+    """Query values which lie on or beside the series values in the given decades.
+
+    For each pair of adjacent series values, including the pair which spans
+    the boundary with the next decade, the values are both series values,
+    the midpoint between the pair, and the exact geometric value which was
+    rounded to obtain the lower series value, together with the neighbouring
+    floating-point numbers of each. The smallest supported value and its
+    neighbours are also included.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        decades: An iterable of decades, as powers of ten.
+
+    Returns:
+        A sorted array of distinct finite query values which are all
+        greater-than or equal-to the smallest supported value.
+    """
+    cardinality = len(series(series_key))
+    points = [_MINIMUM_R_VALUE]
+    for decade in decades:
+        values = [_reference_value_at(series_key, decade, index) for index in range(cardinality)]
+        values.append(_reference_value_at(series_key, decade + 1, 0))
+        for index, (lower, upper) in enumerate(zip(values, values[1:])):
+            points.append(lower)
+            points.append(lower / 2 + upper / 2)
+            points.append(_power_of_ten(decade + index / cardinality))
+        points.append(values[-1])
+    points = np.array(points, dtype=np.float64)
+    points = points[np.isfinite(points)]
+    points = np.concatenate([points, np.nextafter(points, np.inf), np.nextafter(points, -np.inf),
+                             np.nextafter(np.nextafter(points, np.inf), np.inf)])
+    points = np.unique(points)
+    return points[(points >= _MINIMUM_R_VALUE) & np.isfinite(points)]
+
+
+def random_values(size, rng=None, low=_MINIMUM_R_VALUE, high=sys.float_info.max):
+    """Query values drawn log-uniformly from a range.
+
+    Args:
+        size: The number of values.
+        rng: A numpy.random.Generator, or a seed from which to create one.
+        low: The smallest value.
+        high: The largest value.
+
+    Returns:
+        An array of values.
+    """
+    rng = np.random.default_rng(rng)
+    return np.clip(10 ** rng.uniform(np.log10(low), np.log10(high), size=size), low, high)
+
+
+def compare(values, series_keys=None, engines=None, operations=OPERATIONS):
+    """Compare engines with the reference over a set of query values.
+
+    Query values for which the reference raises ValueError, such as those
+    below the smallest supported value, are checked one at a time, and each
+    engine must raise ValueError for them too. The remaining values are
+    passed to each engine as a single batch, which is timed.
+
+    Args:
+        values: An array-like of query values.
+        series_keys: An iterable of series keys, or None for all of the
+            built-in series.
+        engines: An iterable of engine names, or None for all registered engines.
+        operations: An iterable of operation names from OPERATIONS.
+
+    Returns:
+        A DifferentialReport.
+
+    Raises:
+        ValueError: If an engine or operation is not known.
+    """
+    values = np.ravel(np.asarray(values, dtype=np.float64))
+    series_keys = list(RenardSeriesKey) if series_keys is None else list(series_keys)
+    names = list(_engines) if engines is None else list(engines)
+    for name in names:
+        if name not in _engines:
+            raise ValueError("Engine {!r} is not registered".format(name))
+    for operation in operations:
+        if operation not in OPERATIONS:
+            raise ValueError("Operation {!r} is not one of {}".format(operation, ', '.join(OPERATIONS)))
+
+    mismatches = []
+    totals = {}
+    for series_key in series_keys:
+        for operation in operations:
+            reference = getattr(_reference, operation)
+            start = time.perf_counter()
+            expected = [_outcome(reference, series_key, value) for value in values.tolist()]
+            reference_time = time.perf_counter() - start
+            valid = np.array([e is not ValueError for e in expected], dtype=bool)
+            expected_valid = [e for e in expected if e is not ValueError]
+            for name in names:
+                function = getattr(_engines[name], operation, None)
+                if function is None:
+                    continue
+                # Warm up, so that table compilation and JIT compilation are not timed
+                _outcome(function, series_key, values[valid][:1])
+                start = time.perf_counter()
+                try:
+                    actual = list(function(series_key, values[valid]))
+                except ValueError:
+                    actual = None
+                engine_time = time.perf_counter() - start
+                if actual is None:
+                    # Find which values were rejected
+                    actual = [_single_outcome(function, series_key, v) for v in values[valid].tolist()]
+                for value, e, a in zip(values[valid].tolist(), expected_valid, actual):
+                    if a != e:
+                        mismatches.append(Mismatch(name, series_key, operation, value, e, a))
+                for value in values[~valid].tolist():
+                    a = _single_outcome(function, series_key, value)
+                    if a is not ValueError:
+                        mismatches.append(Mismatch(name, series_key, operation, value, ValueError, a))
+                key = (name, operation)
+                count, total_reference, total_engine = totals.get(key, (0, 0.0, 0.0))
+                totals[key] = (count + int(valid.sum()), total_reference + reference_time, total_engine + engine_time)
+    timings = [Timing(name, operation, *totals[name, operation])
+               for name in names for operation in operations if (name, operation) in totals]
+    return DifferentialReport(mismatches, timings)
+
+
+def run(size=10000, rng=None, decades=DEFAULT_DECADES, series_keys=None, engines=None):
+    """Compare engines with the reference over decade edge and random query values.
+
+    Args:
+        size: The number of random query values per series.
+        rng: A numpy.random.Generator, or a seed from which to create one.
+        decades: The decades from which to take decade edge values.
+        series_keys: An iterable of series keys, or None for all of the
+            built-in series.
+        engines: An iterable of engine names, or None for all registered engines.
+
+    Returns:
+        A DifferentialReport combining the comparisons for each series.
+    """
+    rng = np.random.default_rng(rng)
+    series_keys = list(RenardSeriesKey) if series_keys is None else list(series_keys)
+    mismatches = []
+    totals = {}
+    for series_key in series_keys:
+        values = np.concatenate([decade_edge_values(series_key, decades), random_values(size, rng),
+                                 _INVALID_VALUES])
+        report = compare(values, series_keys=[series_key], engines=engines)
+        mismatches.extend(report.mismatches)
+        for timing in report.timings:
+            key = (timing.engine, timing.operation)
+            count, reference_time, engine_time = totals.get(key, (0, 0.0, 0.0))
+            totals[key] = (count + timing.count, reference_time + timing.reference_time,
+                           engine_time + timing.engine_time)
+    timings = [Timing(name, operation, *total) for (name, operation), total in totals.items()]
+    return DifferentialReport(mismatches, timings)
+
+
+_INVALID_VALUES = np.array([np.nan, np.inf, -np.inf, -1.0, 0.0, 1e-201,
+                            np.nextafter(_MINIMUM_R_VALUE, 0.0)])
+
+
+def _reference_value_at(series_key, decade, index):
+    try:
+        return _reference.value_at(series_key, decade, index)
+    except OverflowError:
+        return np.inf
+
+
+def _power_of_ten(exponent):
+    try:
+        return 10 ** exponent
+    except OverflowError:
+        return np.inf
+
+
+def _outcome(function, series_key, value):
+    """The result of a lookup, or ValueError if it was rejected."""
+    try:
+        return function(series_key, value)
+    except ValueError:
+        return ValueError
+
+
+def _single_outcome(function, series_key, value):
+    """The result of a batched lookup of a single value, or ValueError if it was rejected."""
+    return _outcome(lambda s, v: function(s, np.array([v]))[0], series_key, value)
+
+
+def main():
+    report = run()
+    print(report)
+    return 0 if report.ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,10 +1,12 @@
 from math import floor, log10
 
-from renard.renard import _round_sig
+from renard.instrument import instrumented
+from renard.renard import RenardValue, _round_sig
 
 PREFIXES = 'yzafpnµm kMGTPEZY'
 
 
+@instrumented()
 def eng_string(x, sig_figs=3, prefix=True):
     """
     Returns float/int value <x> formatted in a simplified engineering format -
@@ -16,6 +18,8 @@ def eng_string(x, sig_figs=3, prefix=True):
     prefix: Use SI suffix for exponent, e.g. k instead of e3, n instead of
     e-9 etc.
     """
+    if isinstance(x, RenardValue) and len(str(x.mantissa)) <= 3:
+        return _exact_eng_string(x, prefix)
     x = float(x)
     sign = ''
     if x < 0:
@@ -33,13 +37,29 @@ def eng_string(x, sig_figs=3, prefix=True):
         if x3 == int(x3):  # prevent from displaying .0
             x3 = int(x3)
 
-    if prefix and (-24 <= exp3 <= 24) and (exp3 != 0):
-        exp3_text = ' ' + PREFIXES[exp3 // 3 + 8]
-    elif exp3 == 0:
-        exp3_text = ''
+    t3 = str(x3)
+
+    return ''.join((sign, t3, _exponent_text(exp3, prefix)))
+
+
+def _exact_eng_string(value, prefix):
+    """Format a RenardValue, of at most three significant figures, from its digits."""
+    digits = str(value.mantissa)
+    exp = value.exponent + len(digits) - 1
+    exp3 = exp - (exp % 3)
+    shift = value.exponent - exp3
+    if shift >= 0:
+        t3 = digits + '0' * shift
     else:
-        exp3_text = 'e' + str(exp3)
+        digits = digits.rjust(1 - shift, '0')
+        t3 = digits[:shift] + '.' + digits[shift:]
+    return t3 + _exponent_text(exp3, prefix)
 
-    t3 = str(x3)
 
-    return ''.join((sign, t3, exp3_text))
\ No newline at end of file
+def _exponent_text(exp3, prefix):
+    if prefix and (-24 <= exp3 <= 24) and (exp3 != 0):
+        return ' ' + PREFIXES[exp3 // 3 + 8]
+    elif exp3 == 0:
+        return ''
+    else:
+        return 'e' + str(exp3)
\ No newline at end of file
@@ -0,0 +1,260 @@
+"""Opt-in runtime instrumentation for renard.
+
+The principal functions of renard are instrumented so that, once enabled,
+their call counts, latencies and the number of candidate values they
+generate are recorded:
+
+  >>> from renard import instrument
+  >>> instrument.enable()
+  >>> ...
+  >>> stats = instrument.statistics()
+  >>> stats['find_nearest_few'].percentile(99)
+
+Hooks registered with add_hook() are called after every instrumented call,
+which allows measurements to be exported to an external metrics system.
+A hook which raises an exception doesn't affect the instrumented call.
+
+Instrumentation is disabled by default, in which case each instrumented
+function costs only one extra function call and a flag test.
+"""
+
+import copy
+import functools
+import threading
+import warnings
+from math import log2
+from time import perf_counter_ns
+
+_BUCKETS_PER_OCTAVE = 4
+
+_enabled = False
+_lock = threading.Lock()
+_stats = {}
+_hooks = []
+
+
+class FunctionStats:
+    """Accumulated measurements for one instrumented function.
+
+    Attributes:
+        name: The name of the instrumented function.
+        calls: The number of completed calls.
+        total_time: The cumulative latency in seconds.
+        candidates: The cumulative number of candidate values generated,
+            for functions which generate candidates.
+    """
+
+    __slots__ = ('name', 'calls', 'total_time', 'candidates', '_histogram')
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.total_time = 0.0
+        self.candidates = 0
+        self._histogram = {}
+
+    @property
+    def mean_time(self):
+        """The mean latency in seconds, or zero if there have been no calls."""
+        return self.total_time / self.calls if self.calls else 0.0
+
+    def percentile(self, p):
+        """Estimate a latency percentile from the latency histogram.
+
+        Latencies are recorded in logarithmic buckets, four per octave,
+        so the estimate is the upper bound of the bucket containing the
+        percentile and is within 19% of the true value.
+
+        Args:
+            p: The percentile, from 0 to 100 inclusive.
+
+        Returns:
+            The latency in seconds, or zero if there have been no calls.
+
+        Raises:
+            ValueError: If p is outside the range 0 to 100.
+        """
+        if not 0 <= p <= 100:
+            raise ValueError("Percentile {} is not in the range 0 to 100".format(p))
+        if not self.calls:
+            return 0.0
+        threshold = p / 100 * self.calls
+        cumulative = 0
+        for bucket in sorted(self._histogram):
+            cumulative += self._histogram[bucket]
+            if cumulative >= threshold:
+                break
+        return 2 ** ((bucket + 1) / _BUCKETS_PER_OCTAVE) / 1e9
+
+    def _record(self, elapsed_ns, candidates):
+        self.calls += 1
+        self.total_time += elapsed_ns / 1e9
+        if candidates is not None:
+            self.candidates += candidates
+        bucket = int(log2(elapsed_ns) * _BUCKETS_PER_OCTAVE) if elapsed_ns > 0 else 0
+        self._histogram[bucket] = self._histogram.get(bucket, 0) + 1
+
+    def __copy__(self):
+        stats = FunctionStats(self.name)
+        stats.calls = self.calls
+        stats.total_time = self.total_time
+        stats.candidates = self.candidates
+        stats._histogram = dict(self._histogram)
+        return stats
+
+    def __repr__(self):
+        return "{}(name={!r}, calls={}, total_time={}, candidates={})".format(
+            type(self).__name__, self.name, self.calls, self.total_time, self.candidates)
+
+
+def enable():
+    """Start recording measurements for instrumented functions."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stop recording measurements for instrumented functions.
+
+    Measurements recorded so far are retained.
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """True if instrumentation is enabled, otherwise False."""
+    return _enabled
+
+
+def reset():
+    """Discard all recorded measurements."""
+    with _lock:
+        _stats.clear()
+
+
+def statistics():
+    """The measurements recorded so far.
+
+    Returns:
+        A dictionary mapping function names to copies of their FunctionStats
+        objects, for those functions which have been called while
+        instrumentation was enabled. The copies are a consistent snapshot,
+        which is unaffected by later calls.
+    """
+    with _lock:
+        return {name: copy.copy(stats) for name, stats in _stats.items()}
+
+
+def add_hook(hook):
+    """Register a hook to be called after each instrumented call.
+
+    Args:
+        hook: A callable which will be called as hook(name, elapsed, candidates)
+            where name is the function name, elapsed is the latency in seconds
+            and candidates is the number of candidate values generated, or None
+            if the function does not generate candidates. Hooks are called in
+            the thread which made the instrumented call. Exceptions raised by
+            hooks are reported as a RuntimeWarning, rather than propagated.
+    """
+    with _lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """Remove a hook registered with add_hook().
+
+    Raises:
+        ValueError: If the hook is not registered.
+    """
+    with _lock:
+        _hooks.remove(hook)
+
+
+def instrumented(name=None, counted=False):
+    """A decorator which instruments a function.
+
+    Args:
+        name: The name under which measurements will be recorded. By
+            default, the name of the decorated function is used.
+        counted: If True, the length of the result returned by the function
+            is counted as the number of candidates generated.
+    """
+    def decorator(func):
+        func_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = perf_counter_ns()
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                candidates = len(result) if counted and result is not None else None
+                _record(func_name, perf_counter_ns() - start, candidates)
+
+        return wrapper
+
+    return decorator
+
+
+def instrumented_generator(name=None):
+    """A decorator which instruments a generator function.
+
+    The latency recorded is the total time spent producing items, and
+    each item produced is counted as a candidate. Measurements are
+    recorded when the generator is exhausted or closed.
+
+    Args:
+        name: The name under which measurements will be recorded. By
+            default, the name of the decorated function is used.
+    """
+    def decorator(func):
+        func_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            return _timed_iteration(func_name, func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
+
+
+def _timed_iteration(name, iterator):
+    elapsed = 0
+    count = 0
+    try:
+        while True:
+            start = perf_counter_ns()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += perf_counter_ns() - start
+            count += 1
+            yield item
+    finally:
+        _record(name, elapsed, count)
+
+
+def _record(name, elapsed_ns, candidates):
+    with _lock:
+        try:
+            stats = _stats[name]
+        except KeyError:
+            stats = _stats[name] = FunctionStats(name)
+        stats._record(elapsed_ns, candidates)
+        hooks = tuple(_hooks)
+    for hook in hooks:
+        # A failing hook must not break, or replace the exception of, the instrumented call
+        try:
+            hook(name, elapsed_ns / 1e9, candidates)
+        except Exception as exc:
+            warnings.warn("Instrumentation hook {!r} raised {!r}".format(hook, exc), RuntimeWarning)
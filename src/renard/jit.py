@@ -0,0 +1,158 @@
+"""Lookup kernels over compiled tables, compiled with Numba.
+
+The scalar kernels in this module can be called from user code compiled
+with numba.njit, which allows per-element logic to be combined with
+series lookups without returning to the interpreter:
+
+  >>> import numpy as np
+  >>> from numba import njit
+  >>> from renard import R20
+  >>> from renard.jit import nearest_index
+  >>> from renard.vectorized import series_table
+  >>> @njit
+  ... def snap_positive(table, values):
+  ...     result = np.zeros_like(values)
+  ...     for i in range(len(values)):
+  ...         if values[i] > 0:
+  ...             result[i] = table[nearest_index(table, values[i])]
+  ...     return result
+  >>> snap_positive(series_table(R20), np.array([-1.0, 319.0]))
+  array([  0., 315.])
+
+Each kernel takes a table of series values, as returned by
+renard.vectorized.series_table(), and returns a table index. Indexes of
+-1 or len(table) indicate that the result lies beyond the table.
+
+The array kernels, which accept one-dimensional arrays of query values,
+are used by renard.vectorized when the 'numba' backend is selected. All
+kernels release the GIL.
+
+This module requires Numba, which can be installed with the numba extra:
+
+  $ pip install renard[numba]
+"""
+
+import numpy as np
+from numba import njit
+
+_jit = njit(nogil=True, cache=True)
+
+
+@_jit
+def search_left(table, x):
+    """The index of the first table value greater-than or equal-to x."""
+    low = 0
+    high = len(table)
+    while low < high:
+        middle = (low + high) // 2
+        if table[middle] < x:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+@_jit
+def search_right(table, x):
+    """The index of the first table value greater-than x."""
+    low = 0
+    high = len(table)
+    while low < high:
+        middle = (low + high) // 2
+        if table[middle] <= x:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+@_jit
+def greater_than_or_equal_index(table, x):
+    """The index of the smallest value greater-than or equal-to x."""
+    return search_left(table, x)
+
+
+@_jit
+def greater_than_index(table, x):
+    """The index of the smallest value greater-than x."""
+    return search_right(table, x)
+
+
+@_jit
+def less_than_or_equal_index(table, x):
+    """The index of the largest value less-than or equal-to x."""
+    return search_right(table, x) - 1
+
+
+@_jit
+def less_than_index(table, x):
+    """The index of the largest value less-than x."""
+    return search_left(table, x) - 1
+
+
+@_jit
+def nearest_index(table, x):
+    """The index of the value nearest to x, choosing the lower when equidistant."""
+    upper = search_left(table, x)
+    lower = search_right(table, x) - 1
+    if lower < 0:
+        return lower
+    if upper >= len(table):
+        return upper
+    if x - table[lower] <= table[upper] - x:
+        return lower
+    return upper
+
+
+@_jit
+def count_range(table, start, stop):
+    """The number of values from start to stop inclusive."""
+    return max(search_right(table, stop) - search_left(table, start), 0)
+
+
+@_jit
+def greater_than_or_equal_indices(table, x):
+    result = np.empty(len(x), dtype=np.int64)
+    for i in range(len(x)):
+        result[i] = greater_than_or_equal_index(table, x[i])
+    return result
+
+
+@_jit
+def greater_than_indices(table, x):
+    result = np.empty(len(x), dtype=np.int64)
+    for i in range(len(x)):
+        result[i] = greater_than_index(table, x[i])
+    return result
+
+
+@_jit
+def less_than_or_equal_indices(table, x):
+    result = np.empty(len(x), dtype=np.int64)
+    for i in range(len(x)):
+        result[i] = less_than_or_equal_index(table, x[i])
+    return result
+
+
+@_jit
+def less_than_indices(table, x):
+    result = np.empty(len(x), dtype=np.int64)
+    for i in range(len(x)):
+        result[i] = less_than_index(table, x[i])
+    return result
+
+
+@_jit
+def nearest_indices(table, x):
+    result = np.empty(len(x), dtype=np.int64)
+    for i in range(len(x)):
+        result[i] = nearest_index(table, x[i])
+    return result
+
+
+@_jit
+def count_in_range(table, start, stop):
+    result = np.empty(len(start), dtype=np.int64)
+    for i in range(len(start)):
+        result[i] = count_range(table, start[i], stop[i])
+    return result
@@ -0,0 +1,272 @@
+"""Batched lookups split across a pool of threads.
+
+The functions in this module correspond to those of the same names in
+renard.vectorized, but split large arrays of query values into chunks
+which are looked up concurrently by a ThreadPoolExecutor:
+
+  >>> from renard import R20
+  >>> from renard.parallel import find_nearest
+  >>> find_nearest(R20, [319.0, 37726.0])
+  array([  315., 35500.])
+
+Threads share the compiled tables, so unlike a process pool there is no
+cost for pickling the query values, the results or the tables. The lookup
+kernels release the GIL, as do the NumPy operations which gather the
+results, so lookups scale across cores on builds of Python with a GIL as
+well as on free-threaded builds. Arrays no larger than one chunk are
+looked up in the calling thread.
+
+The scaling on the current machine can be measured from the command line:
+
+  $ python -m renard.parallel
+
+This module requires NumPy, which can be installed with the numpy extra:
+
+  $ pip install renard[numpy]
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from renard import vectorized
+from renard.renard import R20
+from renard.tables import compiled_table
+
+DEFAULT_CHUNK_SIZE = 65536
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def find_nearest(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the nearest values, using a pool of threads.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            a thread pool shared by all of the functions in this module,
+            with one thread for each CPU.
+        chunk_size: The number of query values looked up by each task.
+
+    Returns:
+        An array of the values from the specified series closest to the
+        query values, with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _split(vectorized.find_nearest, series_key, values, executor, chunk_size)
+
+
+def find_greater_than_or_equal(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the smallest values greater-than or equal-to the given values, using a pool of threads.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the shared thread pool.
+        chunk_size: The number of query values looked up by each task.
+
+    Returns:
+        An array of values with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _split(vectorized.find_greater_than_or_equal, series_key, values, executor, chunk_size)
+
+
+def find_greater_than(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the smallest values greater-than the given values, using a pool of threads.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the shared thread pool.
+        chunk_size: The number of query values looked up by each task.
+
+    Returns:
+        An array of values with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _split(vectorized.find_greater_than, series_key, values, executor, chunk_size)
+
+
+def find_less_than_or_equal(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the largest values less-than or equal-to the given values, using a pool of threads.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the shared thread pool.
+        chunk_size: The number of query values looked up by each task.
+
+    Returns:
+        An array of values with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _split(vectorized.find_less_than_or_equal, series_key, values, executor, chunk_size)
+
+
+def find_less_than(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the largest values less-than the given values, using a pool of threads.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the shared thread pool.
+        chunk_size: The number of query values looked up by each task.
+
+    Returns:
+        An array of values with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _split(vectorized.find_less_than, series_key, values, executor, chunk_size)
+
+
+def find_nearest_step(series_key, values, executor=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Find the step indexes of the nearest values, using a pool of threads.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        executor: The concurrent.futures.Executor to use, or None to use
+            the shared thread pool.
+        chunk_size: The number of query values looked up by each task.
+
+    Returns:
+        An integer array of step indexes with the same shape as values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _split(vectorized.find_nearest_step, series_key, values, executor, chunk_size, dtype=np.int64)
+
+
+def _split(batch_func, series_key, values, executor, chunk_size, dtype=np.float64):
+    if chunk_size < 1:
+        raise ValueError("Chunk size {} is not positive".format(chunk_size))
+    x = np.asarray(values, dtype=np.float64)
+    if x.size <= chunk_size:
+        return batch_func(series_key, x)
+    compiled_table(series_key)  # Validate the series key, and compile its table before dispatching
+    flat = np.ravel(x)
+    result = np.empty(flat.shape, dtype=dtype)
+    executor = _shared_executor() if executor is None else executor
+    futures = [executor.submit(_fill, batch_func, series_key, flat, result, start, start + chunk_size)
+               for start in range(0, len(flat), chunk_size)]
+    try:
+        for future in futures:
+            future.result()
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+    return result.reshape(x.shape)
+
+
+def _fill(batch_func, series_key, x, result, start, stop):
+    result[start:stop] = batch_func(series_key, x[start:stop])
+
+
+def _shared_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix='renard')
+        return _executor
+
+
+ScalingResult = namedtuple('ScalingResult', ['threads', 'seconds', 'speedup'])
+
+
+def benchmark(series_key=R20, size=4000000, max_threads=None, repeat=5, rng=None):
+    """Measure how the time taken for lookups scales with the number of threads.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        size: The number of query values to look up.
+        max_threads: The largest number of threads to measure, or None for
+            the number of CPUs.
+        repeat: The number of times to repeat each measurement, of which the
+            fastest is used.
+        rng: A numpy.random.Generator, or a seed from which to create one,
+            used to draw the query values.
+
+    Returns:
+        A list of ScalingResults, for one thread and then doubling numbers of
+        threads up to max_threads, giving the time taken and the speedup
+        relative to one thread.
+    """
+    max_threads = os.cpu_count() if max_threads is None else max_threads
+    rng = np.random.default_rng(rng)
+    values = 10 ** rng.uniform(-3, 9, size=size)
+    find_nearest(series_key, values[:1])  # Compile the table, and any JIT kernels
+    thread_counts = []
+    threads = 1
+    while threads < max_threads:
+        thread_counts.append(threads)
+        threads *= 2
+    thread_counts.append(max_threads)
+
+    results = []
+    for threads in thread_counts:
+        chunk_size = -(-size // (threads * 4))
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            seconds = min(_time(find_nearest, series_key, values, executor, chunk_size) for _ in range(repeat))
+        results.append(ScalingResult(threads, seconds, results[0].seconds / seconds if results else 1.0))
+    return results
+
+
+def _time(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)
+    print("Backend {!r}, GIL {}".format(vectorized.get_backend(), 'enabled' if is_gil_enabled() else 'disabled'))
+    print("{:>7} {:>10} {:>8}".format('threads', 'seconds', 'speedup'))
+    for result in benchmark():
+        print("{:>7} {:>10.4f} {:>7.2f}x".format(result.threads, result.seconds, result.speedup))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,8 +3,17 @@ from collections import OrderedDict
 from enum import IntEnum, Enum
 
 import math
+import numbers
+import operator
+import sys
+import threading
+from array import array
+from decimal import Decimal
+from fractions import Fraction
 from math import log10, floor
 
+from renard.instrument import instrumented, instrumented_generator
+
 _MINIMUM_R_VALUE = 1e-200
 
 
@@ -56,6 +65,39 @@ RRR10 = RenardSeriesKey.RRR10
 RRR20 = RenardSeriesKey.RRR20
 
 
+class CustomSeriesKey:
+    """The identifier of a custom series of preferred numbers.
+
+    Custom series keys are created by register_series(), and can then be
+    used wherever an RenardSeriesKey can be used.
+    """
+
+    __slots__ = ('_name', '_cardinality', '_precision')
+
+    def __init__(self, name, cardinality, precision):
+        self._name = name
+        self._cardinality = cardinality
+        self._precision = precision
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def cardinality(self):
+        return self._cardinality
+
+    @property
+    def precision(self):
+        return self._precision
+
+    def __reduce__(self):
+        return series_key_from_name, (self._name,)
+
+    def __repr__(self):
+        return "<{}.{}: ({}, {})>".format(type(self).__name__, self._name, self._cardinality, self._precision)
+
+
 _R = OrderedDict((
     (R5,  (1.00, 1.60, 2.50, 4.00, 6.30)),
 
@@ -142,14 +184,18 @@ def series_keys():
     """The available series keys.
 
     Note:
-        The series keys returned will be members of the RenardSeriesKey enumeration.
-        These are useful for programmatic use. For constant values consider
-        using the module aliases R5, R10, R20, etc.
+        The series keys returned will be members of the RenardSeriesKey enumeration,
+        followed by the CustomSeriesKeys of any series registered with
+        register_series(). These are useful for programmatic use. For constant
+        values consider using the module aliases R5, R10, R20, etc.
 
     Returns:
-        A set-like object containing the series-keys.
+        A set-like object containing the series-keys, which is not affected
+        by series registered later.
     """
-    return _R.keys()
+    # Copy under the lock, so concurrent registration can't disturb iteration
+    with _registry_lock:
+        return OrderedDict.fromkeys(_R).keys()
 
 
 def series_key_from_name(name):
@@ -166,23 +212,135 @@ def series_key_from_name(name):
     """
     try:
         return RenardSeriesKey[name]
+    except KeyError:
+        pass
+    try:
+        return _custom_series_keys[name]
     except KeyError:
         raise ValueError("Renard series with name {!r} not found. Available Renard series keys are {}"
                          .format(name,
                                  ', '.join(str(key.name) for key in series_keys())))
 
 
-LOG10_MANTISSA_E = {num: list(map(lambda x: log10(x) % 1, series)) for num, series in _R.items()}
+def _log10_mantissas(base_values):
+    return list(map(lambda x: log10(x) % 1, base_values))
+
+
+def _geometric_scale(base_values):
+    # Includes the ratio from the last value to the first value of the next decade
+    return max(b/a for a, b in zip(base_values, base_values[1:] + (10 * base_values[0],)))
+
+
+LOG10_MANTISSA_E = {num: _log10_mantissas(series) for num, series in _R.items()}
+
+GEOMETRIC_SCALE_E = {num: _geometric_scale(series) for num, series in _R.items()}
+
+_custom_series_keys = {}
+_registry_lock = threading.Lock()
+
+
+def register_series(name, base_values, precision):
+    """Register a custom series of preferred numbers.
+
+    Once registered, the series can be used with all of the functions
+    which accept a series key, in the same way as the built-in series.
+    Series may be registered while other threads are performing lookups.
+
+    Args:
+        name: The name of the series, for example 'E12'. It must not be the
+            name of a built-in or previously registered series.
+        base_values: The values of the series in the decade from one to ten,
+            in ascending order, beginning with one. For example,
+            (1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2).
+        precision: The multiple to which the base values have been rounded,
+            for example 0.1. It must be greater than zero and no greater
+            than one.
 
-GEOMETRIC_SCALE_E = {num: max(b/a for a, b in zip(series, series[1:])) for num, series in _R.items()}
+    Returns:
+        A CustomSeriesKey which can be used as a series_key.
 
+    Raises:
+        ValueError: If name is not a non-empty string, or is already in use.
+        ValueError: If there are fewer than two base values.
+        ValueError: If the base values do not begin with one, are not all
+            less than ten, or are not strictly ascending.
+        ValueError: If precision is out of range.
+        ValueError: If any base value is not a multiple of precision, or
+            would not be reproduced when series values are rounded to the
+            significant figures implied by precision.
+    """
+    if not isinstance(name, str) or not name:
+        raise ValueError("Series name {!r} is not a non-empty string".format(name))
+    base_values = tuple(float(value) for value in base_values)
+    if len(base_values) < 2:
+        raise ValueError("Series {} has {} base values, at least two are required".format(name, len(base_values)))
+    if base_values[0] != 1.0:
+        raise ValueError("Series {} must begin with 1.0, not {}".format(name, base_values[0]))
+    if not base_values[-1] < 10.0:
+        raise ValueError("Series {} base values must be less than 10.0, but include {}".format(name, base_values[-1]))
+    for a, b in zip(base_values, base_values[1:]):
+        if not a < b:
+            raise ValueError("Series {} base values are not strictly ascending at {} and {}".format(name, a, b))
+    if not 0 < precision <= 1:
+        raise ValueError("Series {} precision {} is not greater than zero and at most one".format(name, precision))
+    for value in base_values:
+        multiple = value / precision
+        if not math.isclose(multiple, round(multiple), rel_tol=1e-9):
+            raise ValueError("Series {} base value {} is not a multiple of the precision {}".format(
+                name, value, precision))
+        # Series values are rounded to the significant figures implied by the precision
+        figures = abs(floor(log10(precision))) + 1
+        if _round_sig(value, figures) != value:
+            raise ValueError("Series {} base value {} is not preserved by rounding to the {} significant figures "
+                             "implied by the precision {}".format(name, value, figures, precision))
+
+    with _registry_lock:
+        if name in RenardSeriesKey.__members__ or name in _custom_series_keys:
+            raise ValueError("Series name {!r} is already in use".format(name))
+        series_key = CustomSeriesKey(name, len(base_values), precision)
+        LOG10_MANTISSA_E[series_key] = _log10_mantissas(base_values)
+        GEOMETRIC_SCALE_E[series_key] = _geometric_scale(base_values)
+        _R[series_key] = base_values
+        # Published last, so that the key can't be found by name until its tables are complete
+        _custom_series_keys[name] = series_key
+    return series_key
+
+
+def unregister_series(series_key):
+    """Unregister a custom series of preferred numbers.
+
+    The series key can no longer be used, and its name may be registered
+    again. A series should not be unregistered while it is being used by
+    other threads.
 
-def find_greater_than_or_equal(series_key, value):
+    Args:
+        series_key: A CustomSeriesKey returned by register_series().
+
+    Raises:
+        ValueError: If series_key is not a registered custom series.
+    """
+    with _registry_lock:
+        if _custom_series_keys.get(getattr(series_key, 'name', None)) is not series_key:
+            raise ValueError("{!r} is not a registered custom series".format(series_key))
+        # Withdrawn first, so that the key can't be found by name while its tables are removed
+        del _custom_series_keys[series_key.name]
+        del _R[series_key]
+        del LOG10_MANTISSA_E[series_key]
+        del GEOMETRIC_SCALE_E[series_key]
+        _ROUNDING.pop(series_key, None)
+        _exact_bases.pop(series_key, None)
+    from renard import tables  # Imported here, as renard.tables depends on this module
+    tables.discard_table(series_key)
+
+
+@instrumented()
+def find_greater_than_or_equal(series_key, value, exact=False):
     """Find the smallest value greater-than or equal-to the given value.
 
     Args:
         series_key: An Renard series key such as R20.
         value: The query value.
+        exact: If True, return a RenardValue rather than a float.
 
     Returns:
         The smallest value from the specified series which is greater-than
@@ -193,18 +351,21 @@ def find_greater_than_or_equal(series_key, value):
         ValueError: If value is not finite.
         ValueError: If value is out of range.
     """
-    candidates = find_nearest_few(series_key, value, num=3)
-    for candidate in candidates:
-        if candidate >= value:
-            return candidate
+    value_at_step = _step_value_function(series_key, value)
+    step = _lower_step(series_key, value, value_at_step)
+    if value_at_step(step) < value:
+        step += 1
+    return _result(series_key, step, value_at_step, value, exact)
 
 
-def find_greater_than(series_key, value):
+@instrumented()
+def find_greater_than(series_key, value, exact=False):
     """Find the smallest value greater-than or equal-to the given value.
 
     Args:
         series_key: An Renard series key such as R20.
         value: The query value.
+        exact: If True, return a RenardValue rather than a float.
 
     Returns:
         The smallest value from the specified series which is greater-than
@@ -215,18 +376,19 @@ def find_greater_than(series_key, value):
         ValueError: If value is not finite.
         ValueError: If value is out of range.
     """
-    candidates = find_nearest_few(series_key, value, num=3)
-    for candidate in candidates:
-        if candidate > value:
-            return candidate
+    value_at_step = _step_value_function(series_key, value)
+    step = _lower_step(series_key, value, value_at_step) + 1
+    return _result(series_key, step, value_at_step, value, exact)
 
 
-def find_less_than_or_equal(series_key, value):
+@instrumented()
+def find_less_than_or_equal(series_key, value, exact=False):
     """Find the largest value less-than or equal-to the given value.
 
     Args:
         series_key: An Renard series key such as R20.
         value: The query value.
+        exact: If True, return a RenardValue rather than a float.
 
     Returns:
         The largest value from the specified series which is less-than
@@ -237,18 +399,19 @@ def find_less_than_or_equal(series_key, value):
         ValueError: If value is not finite.
         ValueError: If value is out of range.
     """
-    candidates = find_nearest_few(series_key, value, num=3)
-    for candidate in reversed(candidates):
-        if candidate <= value:
-            return candidate
+    value_at_step = _step_value_function(series_key, value)
+    step = _lower_step(series_key, value, value_at_step)
+    return _result(series_key, step, value_at_step, value, exact)
 
 
-def find_less_than(series_key, value):
+@instrumented()
+def find_less_than(series_key, value, exact=False):
     """Find the largest value less-than or equal-to the given value.
 
     Args:
         series_key: An Renard series key such as R20.
         value: The query value.
+        exact: If True, return a RenardValue rather than a float.
 
     Returns:
         The largest value from the specified series which is less-than
@@ -259,18 +422,21 @@ def find_less_than(series_key, value):
         ValueError: If value is not finite.
         ValueError: If value is out of range.
     """
-    candidates = find_nearest_few(series_key, value, num=3)
-    for candidate in reversed(candidates):
-        if candidate < value:
-            return candidate
+    value_at_step = _step_value_function(series_key, value)
+    step = _lower_step(series_key, value, value_at_step)
+    if value_at_step(step) == value:
+        step -= 1
+    return _result(series_key, step, value_at_step, value, exact)
 
 
-def find_nearest(series_key, value):
+@instrumented()
+def find_nearest(series_key, value, exact=False):
     """Find the nearest value.
 
     Args:
         series_key: The RenardSeriesKey to use.
         value: The value for which the nearest value is to be found.
+        exact: If True, return a RenardValue rather than a float.
 
     Returns:
         The value in the specified Renard series closest to value.
@@ -280,48 +446,142 @@ def find_nearest(series_key, value):
         ValueError: If value is not finite.
         ValueError: If value is out of range.
     """
-    return find_nearest_few(series_key, value, num=1)[0]
+    return find_nearest_few(series_key, value, num=1, exact=exact)[0]
 
 
-def find_nearest_few(series_key, value, num=3):
+@instrumented(counted=True)
+def find_nearest_few(series_key, value, num=3, order='value', exact=False):
     """Find the nearest values.
 
+    The values are found by expanding outwards from the value in both
+    directions, one step at a time, so the cost grows only linearly
+    with num.
+
     Args:
         series_key: The RenardSeriesKey to use.
         value: The value for which the nearest values are to be found.
-        num: The number of nearby values to find: 1, 2 or 3.
+        num: The number of nearby values to find, which must be at least one.
+        order: 'value' to order the results from lowest to highest, or
+            'distance' to order them from nearest to furthest. Values at
+            equal distances are ordered from lowest to highest.
+        exact: If True, return RenardValues rather than floats.
 
     Returns:
-        A tuple containing num values. With num == 3 it is guaranteed
-        that  at least one item less than value, and one item greater
+        A tuple containing num values. With num >= 3 it is guaranteed
+        that at least one item less than value, and one item greater
         than value.
 
     Raises:
         ValueError: If series_key is not known.
-        ValueError: If num is not 1, 2 or 3.
+        ValueError: If num is not a positive integer.
+        ValueError: If order is not 'value' or 'distance'.
         ValueError: If value is not finite.
         ValueError: If value is out of range.
     """
-    if num not in {1, 2, 3}:
-        raise ValueError("num {} is not 1, 2 or 3".format(num))
-    start = value / pow(GEOMETRIC_SCALE_E[series_key], 1.5)
-    stop = value * pow(GEOMETRIC_SCALE_E[series_key], 1.5)
-    candidates = tuple(rrange(series_key, start, stop))
-    nearest = _nearest_n(candidates, value, num)
-    return nearest
+    if not isinstance(num, numbers.Integral) or num < 1:
+        raise ValueError("num {} is not a positive integer".format(num))
+    if order not in _ORDERS:
+        raise ValueError("order {!r} is not one of {}".format(order, ', '.join(map(repr, _ORDERS))))
+    value_at_step = _step_value_function(series_key, value)
+    lower_step = _lower_step(series_key, value, value_at_step)
+    upper_step = lower_step + 1
+    for _ in range(num):
+        if value - value_at_step(lower_step) <= value_at_step(upper_step) - value:
+            lower_step -= 1
+        else:
+            upper_step += 1
+    first_step = lower_step + 1
+    last_step = upper_step - 1
+
+    if num >= 3:
+        if value_at_step(last_step) <= value:
+            first_step += 1
+            last_step += 1
+        elif value_at_step(first_step) >= value:
+            first_step -= 1
+            last_step -= 1
+
+    _checked(value_at_step(first_step), value)
+    _checked(value_at_step(last_step), value)
+    steps = range(first_step, last_step + 1)
+    if order == 'distance':
+        steps = sorted(steps, key=lambda step: abs(value_at_step(step) - value))
+    if exact:
+        return tuple(RenardValue.from_step(series_key, step) for step in steps)
+    return tuple(value_at_step(step) for step in steps)
+
+
+_ORDERS = ('value', 'distance')
+
+
+def _step_value_function(series_key, value):
+    """Validate a query value, and return a function which memoizes the series values at step indexes."""
+    cardinality = len(series(series_key))
+    if not math.isfinite(value):
+        raise ValueError("Value {} is not finite".format(value))
+    if value < _MINIMUM_R_VALUE:
+        raise ValueError("{} is too small. The value must greater than or equal to {}".format(value, _MINIMUM_R_VALUE))
+    step_values = {}
+
+    def value_at_step(step):
+        try:
+            return step_values[step]
+        except KeyError:
+            result = step_values[step] = _step_value(series_key, step, cardinality)
+            return result
+
+    return value_at_step
+
+
+def _checked(result, value):
+    if not _MINIMUM_R_VALUE <= result < math.inf:
+        raise ValueError("The result for {} is out of range".format(value))
+    return result
+
+
+def _result(series_key, step, value_at_step, value, exact):
+    result = _checked(value_at_step(step), value)
+    return RenardValue.from_step(series_key, step) if exact else result
+
+
+def _lower_step(series_key, value, value_at_step):
+    """The step index of the largest series value less-than or equal-to value."""
+    series_log = LOG10_MANTISSA_E[series_key]
+    decade, mantissa = _decade_mantissa(log10(value))
+    step = decade * len(series_log) + bisect_right(series_log, mantissa) - 1
+    # The mantissa table is not exact, so correct against the rounded values
+    while value_at_step(step) > value:
+        step -= 1
+    while value_at_step(step + 1) <= value:
+        step += 1
+    return step
+
+
+def _step_value(series_key, step, cardinality):
+    """The series value at a step index, or infinity if it is too large to represent."""
+    decade, index = divmod(step, cardinality)
+    try:
+        return _value_at(series_key, decade, index)
+    except OverflowError:
+        return math.inf
 
 
-def rrange(series_key, start, stop):
+def rrange(series_key, start, stop, reverse=False, exact=False):
     """Generate Renard values in a range inclusive of the start and stop values.
 
     Args:
         series_key: The RenardSeriesKey to use.
         start: The beginning of the range. The yielded values may include this value.
         stop: The end of the range. The yielded values may include this value.
+        reverse: If True, yield the values from highest to lowest.
+        exact: If True, yield RenardValues rather than floats. The bounds of
+            the range are found once, and no rounding is performed for the
+            values within it.
 
     Yields:
         Values from the specified range which lie between the start and stop
-        values inclusively, and in order from lowest to highest.
+        values inclusively, and in order from lowest to highest, or from
+        highest to lowest if reverse is True.
 
     Raises:
         ValueError: If series_key is not known.
@@ -340,48 +600,113 @@ def rrange(series_key, start, stop):
     if not start <= stop:
         raise ValueError("Start value {} must be less than stop value {}".format(start, stop))
 
-    return _rrange(series_key, start, stop)
+    if exact:
+        return _exact_rrange(series_key, start, stop, reverse)
+    return _rrange(series_key, start, stop, reverse)
+
+
+@instrumented_generator()
+def _rrange(series_key, start, stop, reverse=False):
+    first_step, last_step = _step_bounds(series_key, start, stop)
+    series_values, series_decade, figures = _rounding(series_key)
+    cardinality = len(series_values)
+    start_decade, start_index = divmod(first_step, cardinality)
+    stop_decade, stop_index = divmod(last_step, cardinality)
+    decades = range(start_decade, stop_decade + 1)
+    for decade in (reversed(decades) if reverse else decades):
+        index_begin = start_index if decade == start_decade else 0
+        index_end = stop_index + 1 if decade == stop_decade else cardinality
+        indexes = range(index_begin, index_end)
+        scale = math.pow(10, decade - series_decade)
+        for index in (reversed(indexes) if reverse else indexes):
+            rounded_result = _round_sig(series_values[index] * scale, figures)
+            if start <= rounded_result <= stop:
+                yield rounded_result
+
 
+@instrumented_generator()
+def _exact_rrange(series_key, start, stop, reverse=False):
+    steps = _range_steps(series_key, start, stop)
+    for step in (reversed(steps) if reverse else steps):
+        yield RenardValue.from_step(series_key, step)
 
-def _rrange(series_key, start, stop):
-    series_values = series(series_key)
+
+def _range_steps(series_key, start, stop):
+    """The step indexes of the series values from start to stop inclusive."""
+    start_value_at_step = _step_value_function(series_key, start)
+    first_step = _lower_step(series_key, start, start_value_at_step)
+    if start_value_at_step(first_step) < start:
+        first_step += 1
+    last_step = _lower_step(series_key, stop, _step_value_function(series_key, stop))
+    return range(first_step, last_step + 1)
+
+
+def _step_bounds(series_key, start, stop):
+    """The inclusive range of step indexes of the candidate values between start and stop.
+
+    A step index is decade * cardinality + index. The candidates may extend
+    slightly beyond start and stop, so values must be checked against them.
+    """
+    series(series_key)  # Validate the series key
     series_log = LOG10_MANTISSA_E[series_key]
+    cardinality = len(series_log)
     epsilon = (series_log[-1] - series_log[-2]) / 2
     start_log = log10(start) - epsilon
     start_decade, start_mantissa = _decade_mantissa(start_log)
     start_index = bisect_left(series_log, start_mantissa)
-    if start_index == len(series_log):
-        # Wrap to next decade
-        start_decade += 1
-        start_index = 0
     stop_log = log10(stop) + epsilon
     stop_decade, stop_mantissa = _decade_mantissa(stop_log)
     stop_index = bisect_right(series_log, stop_mantissa)
     assert stop_index != 0
-    series_decade = int(log10(series_values[0]))
-    for decade in range(start_decade, stop_decade + 1):
-        index_begin = start_index if decade == start_decade else 0
-        index_end = stop_index if decade == stop_decade else len(series_log)
-        for index in range(index_begin, index_end):
-            found = series_values[index]
-            scale_exponent = decade - series_decade
-            result = found * math.pow(10, scale_exponent)
-            rounded_result = _round_sig(result, figures=series_decade + abs(floor(log10(series_key.precision))) + 1)
-            if start <= rounded_result <= stop:
-                yield rounded_result
+    # A start_index of cardinality wraps to the first index of the next decade
+    return start_decade * cardinality + start_index, stop_decade * cardinality + stop_index - 1
+
+
+def _step_of(series_key, value):
+    """The step index of a value from the series."""
+    series_log = LOG10_MANTISSA_E[series_key]
+    decade, mantissa = _decade_mantissa(log10(value))
+    index = bisect_left(series_log, mantissa)
+    if index != 0:
+        upper_log = series_log[index] if index != len(series_log) else 1.0
+        if mantissa - series_log[index - 1] <= upper_log - mantissa:
+            index -= 1
+    return decade * len(series_log) + index
+
+
+def _value_at(series_key, decade, index):
+    series_values, series_decade, figures = _rounding(series_key)
+    return _round_sig(series_values[index] * math.pow(10, decade - series_decade), figures)
+
+
+def _rounding(series_key):
+    """The base values of a series, their decade, and the significant figures to which scaled values are rounded."""
+    try:
+        return _ROUNDING[series_key]
+    except KeyError:
+        series_values = series(series_key)
+        series_decade = int(log10(series_values[0]))
+        figures = series_decade + abs(floor(log10(series_key.precision))) + 1
+        result = _ROUNDING[series_key] = (series_values, series_decade, figures)
+        return result
+
+
+_ROUNDING = {}
 
 
-def open_rrange(series_key, start, stop):
+def open_rrange(series_key, start, stop, reverse=False):
     """Generate Renard values in a half-open range inclusive of start, but exclusive of stop.
 
     Args:
         series_key: The RenardSeriesKey to use.
         start: The beginning of the range. The yielded values may include this value.
         stop: The end of the range. The yielded values will not include this value.
+        reverse: If True, yield the values from highest to lowest.
 
     Yields:
         Values from the specified range which lie in the half-open range defined by
-        the start and stop values, from lowest to highest.
+        the start and stop values, from lowest to highest, or from highest to lowest
+        if reverse is True.
 
     Raises:
         ValueError: If series_key is not known.
@@ -399,14 +724,341 @@ def open_rrange(series_key, start, stop):
         raise ValueError("{} is too small. The stop value must greater than or equal to {}".format(stop, _MINIMUM_R_VALUE))
     if not start <= stop:
         raise ValueError("Start value {} must be less than stop value {}".format(start, stop))
-    return (item for item in rrange(series_key, start, stop) if item != stop)
+    return (item for item in rrange(series_key, start, stop, reverse) if item != stop)
+
+
+class RenardCursor:
+    """A position within a Renard series which can be stepped up or down.
+
+    Each step moves to the adjacent value in the series, crossing into
+    the next or previous decade as necessary, in constant time.
+
+    Args:
+        series_key: The RenardSeriesKey to use.
+        value: The initial position of the cursor will be the smallest
+            value in the series greater-than or equal-to this value.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If value is not finite.
+        ValueError: If value is out of range.
+    """
+
+    def __init__(self, series_key, value):
+        self._series_key = series_key
+        self._cardinality = len(series(series_key))
+        self._step = _step_of(series_key, find_greater_than_or_equal(series_key, value))
+
+    @property
+    def series_key(self):
+        return self._series_key
+
+    @property
+    def step(self):
+        """The step index of the current value, which is decade * cardinality + index."""
+        return self._step
+
+    @property
+    def value(self):
+        """The current value."""
+        decade, index = divmod(self._step, self._cardinality)
+        return _value_at(self._series_key, decade, index)
+
+    def up(self):
+        """Move to the next higher value in the series.
+
+        Returns:
+            The new current value.
+
+        Raises:
+            ValueError: If the next higher value is out of range.
+        """
+        return self._move(+1)
+
+    def down(self):
+        """Move to the next lower value in the series.
+
+        Returns:
+            The new current value.
+
+        Raises:
+            ValueError: If the next lower value is out of range.
+        """
+        return self._move(-1)
+
+    def _move(self, delta):
+        value = _step_value(self._series_key, self._step + delta, self._cardinality)
+        if not _MINIMUM_R_VALUE <= value < math.inf:
+            raise ValueError("Cannot move cursor beyond {}, the next value is out of range".format(self.value))
+        self._step += delta
+        return value
+
+    def __repr__(self):
+        return "{}({!r}, {!r})".format(type(self).__name__, self._series_key, self.value)
+
+
+class RenardValue:
+    """An exact value from a Renard series.
+
+    The value is mantissa * 10 ** exponent, where mantissa is an integer
+    with no trailing zeros. RenardValues are returned by the lookup
+    functions and rrange() when called with exact=True, or can be obtained
+    from a step index with RenardValue.from_step().
 
+    Like decimal.Decimal, comparison and hashing are exact and numeric.
+    Numerically equal values from different series are equal, but a value
+    is not equal to a float which only approximates it. For example, the
+    R10 value 3.15 is not equal to the float 3.15. Use float() to convert
+    a value to the nearest float, which is the value that the lookup
+    functions return when exact is False.
 
-def _nearest_n(candidates, value, n):
-    abs_deltas = tuple(abs(c - value) for c in candidates)
-    indexes = [index for index, _ in sorted(enumerate(abs_deltas), key=lambda x: x[1])]
-    nearest_three = tuple(sorted(candidates[i] for i in indexes[:n]))
-    return nearest_three
+    Args:
+        series_key: The series of which the value is a member.
+        mantissa: A positive integer.
+        exponent: An integer power of ten.
+    """
+
+    __slots__ = ('_series_key', '_mantissa', '_exponent')
+
+    def __init__(self, series_key, mantissa, exponent):
+        while mantissa % 10 == 0 and mantissa != 0:
+            mantissa //= 10
+            exponent += 1
+        self._series_key = series_key
+        self._mantissa = mantissa
+        self._exponent = exponent
+
+    @classmethod
+    def from_step(cls, series_key, step):
+        """The series value at a step index.
+
+        Args:
+            series_key: An Renard series key such as R20.
+            step: The step index of the value, which is decade * cardinality + index.
+
+        Returns:
+            A RenardValue.
+
+        Raises:
+            ValueError: If series_key is not known.
+            ValueError: If the value is out of range.
+        """
+        pairs, _ = _exact_base_values(series_key)
+        decade, index = divmod(step, len(pairs))
+        mantissa, exponent = pairs[index]
+        if not _MINIMUM_DECADE <= decade <= _MAXIMUM_DECADE or (
+                decade == _MAXIMUM_DECADE and mantissa * _POWERS_OF_TEN[exponent + decade] > _MAXIMUM_INTEGER):
+            raise ValueError("Step {} of {} is out of range".format(step, series_key.name))
+        return cls(series_key, mantissa, exponent + decade)
+
+    @property
+    def series_key(self):
+        return self._series_key
+
+    @property
+    def mantissa(self):
+        """The integer mantissa, which has no trailing zeros."""
+        return self._mantissa
+
+    @property
+    def exponent(self):
+        """The power of ten by which the mantissa is multiplied."""
+        return self._exponent
+
+    @property
+    def step(self):
+        """The step index of the value, which is decade * cardinality + index."""
+        pairs, indexes = _exact_base_values(self._series_key)
+        figures = len(str(self._mantissa))
+        try:
+            index = indexes[self._mantissa, 1 - figures]
+        except KeyError:
+            raise ValueError("{} is not a value of series {}".format(self, self._series_key.name))
+        return (self._exponent + figures - 1) * len(pairs) + index
+
+    def next(self, steps=1):
+        """The value a number of steps higher in the series.
+
+        Raises:
+            ValueError: If the value is out of range.
+        """
+        return RenardValue.from_step(self._series_key, self.step + steps)
+
+    def previous(self, steps=1):
+        """The value a number of steps lower in the series.
+
+        Raises:
+            ValueError: If the value is out of range.
+        """
+        return RenardValue.from_step(self._series_key, self.step - steps)
+
+    def __float__(self):
+        if self._exponent >= 0:
+            return float(self._mantissa * _POWERS_OF_TEN[self._exponent])
+        # Integer true division is correctly rounded
+        return self._mantissa / _POWERS_OF_TEN[-self._exponent]
+
+    def __hash__(self):
+        # Consistent with the hashes of numerically equal ints, floats and Fractions
+        if self._exponent >= 0:
+            return self._mantissa * pow(10, self._exponent, _HASH_MODULUS) % _HASH_MODULUS
+        return self._mantissa * pow(_INVERSE_TEN, -self._exponent, _HASH_MODULUS) % _HASH_MODULUS
+
+    def __eq__(self, other):
+        if isinstance(other, RenardValue):
+            return self._mantissa == other._mantissa and self._exponent == other._exponent
+        if isinstance(other, numbers.Real):
+            return self._fraction() == other
+        return NotImplemented
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    def _compare(self, other, op):
+        if isinstance(other, RenardValue):
+            exponent = min(self._exponent, other._exponent)
+            return op(self._mantissa * _POWERS_OF_TEN[self._exponent - exponent],
+                      other._mantissa * _POWERS_OF_TEN[other._exponent - exponent])
+        if isinstance(other, numbers.Real):
+            return op(self._fraction(), other)
+        return NotImplemented
+
+    def _fraction(self):
+        if self._exponent >= 0:
+            return Fraction(self._mantissa * _POWERS_OF_TEN[self._exponent])
+        return Fraction(self._mantissa, _POWERS_OF_TEN[-self._exponent])
+
+    def __str__(self):
+        return str(Decimal(self._mantissa).scaleb(self._exponent))
+
+    def __repr__(self):
+        return "{}({}, {!r})".format(type(self).__name__, self._series_key.name, str(self))
+
+    def __reduce__(self):
+        return type(self), (self._series_key, self._mantissa, self._exponent)
+
+
+class RenardValueArray:
+    """A compact array of exact values from one Renard series.
+
+    The values are stored as their step indexes in an array('q'), using
+    eight bytes per value, and are converted to RenardValues when they are
+    accessed. The step indexes are available through the steps attribute,
+    and can be passed directly to renard.vectorized.value_at_step() to
+    obtain the values as floats in bulk.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        steps: An iterable of integer step indexes.
+
+    Raises:
+        ValueError: If series_key is not known.
+    """
+
+    __slots__ = ('_series_key', '_steps')
+
+    def __init__(self, series_key, steps=()):
+        series(series_key)  # Validate the series key
+        self._series_key = series_key
+        self._steps = array('q', steps)
+
+    @classmethod
+    def from_values(cls, series_key, values):
+        """Pack RenardValues into an array.
+
+        Raises:
+            ValueError: If any value is not from the series.
+        """
+        steps = []
+        for value in values:
+            if value.series_key != series_key:
+                raise ValueError("{!r} is not a value of series {}".format(value, series_key.name))
+            steps.append(value.step)
+        return cls(series_key, steps)
+
+    @classmethod
+    def from_range(cls, series_key, start, stop):
+        """The values in a range inclusive of the start and stop values.
+
+        This contains the same values as rrange(), but finds only the
+        bounds of the range, so its cost barely depends on the number of
+        values in the range.
+
+        Raises:
+            ValueError: If series_key is not known.
+            ValueError: If start is not less-than or equal-to stop.
+            ValueError: If start or stop are not both finite.
+            ValueError: If start or stop are out of range.
+        """
+        rrange(series_key, start, stop)  # Validate the range
+        steps = _range_steps(series_key, start, stop)
+        return cls(series_key, array('q', steps))
+
+    @property
+    def series_key(self):
+        return self._series_key
+
+    @property
+    def steps(self):
+        """The step indexes of the values, as an array('q')."""
+        return self._steps
+
+    def floats(self):
+        """The values as an array('d') of floats."""
+        return array('d', map(float, self))
+
+    def __len__(self):
+        return len(self._steps)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RenardValueArray(self._series_key, self._steps[index])
+        return RenardValue.from_step(self._series_key, self._steps[index])
+
+    def __iter__(self):
+        series_key = self._series_key
+        return (RenardValue.from_step(series_key, step) for step in self._steps)
+
+    def __eq__(self, other):
+        if not isinstance(other, RenardValueArray):
+            return NotImplemented
+        return self._series_key == other._series_key and self._steps == other._steps
+
+    def __repr__(self):
+        return "{}({}, {!r})".format(type(self).__name__, self._series_key.name, self._steps.tolist())
+
+
+def _exact_base_values(series_key):
+    """The base values of a series as exact (mantissa, exponent) pairs, and a mapping from the pairs to indexes."""
+    try:
+        return _exact_bases[series_key]
+    except KeyError:
+        pass
+    pairs = []
+    for index in range(len(series(series_key))):
+        _, digits, exponent = Decimal(repr(_value_at(series_key, 0, index))).normalize().as_tuple()
+        pairs.append((int(''.join(map(str, digits))), exponent))
+    result = tuple(pairs), {pair: index for index, pair in enumerate(pairs)}
+    return _exact_bases.setdefault(series_key, result)
+
+
+_exact_bases = {}
+
+_MINIMUM_DECADE = int(floor(log10(_MINIMUM_R_VALUE)))
+_MAXIMUM_DECADE = int(floor(log10(sys.float_info.max)))
+_MAXIMUM_INTEGER = int(sys.float_info.max)
+_POWERS_OF_TEN = tuple(10 ** power for power in range(_MAXIMUM_DECADE - _MINIMUM_DECADE + 10))
+_HASH_MODULUS = sys.hash_info.modulus
+_INVERSE_TEN = pow(10, _HASH_MODULUS - 2, _HASH_MODULUS)
 
 
 def _round_sig(x, figures=6):
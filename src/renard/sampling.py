@@ -0,0 +1,118 @@
+"""Random sampling of Renard values, using NumPy.
+
+Samples are drawn over the step indexes of a series within a range, and
+converted to values by indexing into the compiled tables in renard.tables,
+so the values in the range are never generated individually.
+
+This module requires NumPy, which can be installed with the numpy extra:
+
+  $ pip install renard[numpy]
+"""
+
+import math
+
+import numpy as np
+
+from renard.renard import series
+from renard.vectorized import series_table
+
+DISTRIBUTIONS = ('uniform', 'log-uniform')
+
+
+def sample(series_key, start, stop, size, rng=None, distribution='uniform', weights=None):
+    """Draw random values from a series within an inclusive range.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        start: The beginning of the range. The values drawn may include this value.
+        stop: The end of the range. The values drawn may include this value.
+        size: The number of values to draw, or a tuple giving the shape of
+            the array of values to draw.
+        rng: A numpy.random.Generator, or a seed from which to create one.
+            If None, fresh entropy is used.
+        distribution: 'uniform' to draw each value in the range with equal
+            probability, or 'log-uniform' to draw values in proportion to the
+            width, on a logarithmic scale, of the interval of numbers for which
+            they are the nearest value.
+        weights: An optional sequence of relative weights, one for each base
+            value of the series, which apply to that base value in every decade.
+            Only applicable to the 'uniform' distribution.
+
+    Returns:
+        An array of the values drawn.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If start is not less-than or equal-to stop.
+        ValueError: If start or stop are not both finite.
+        ValueError: If the range contains no values.
+        ValueError: If distribution is not known.
+        ValueError: If weights are given for the 'log-uniform' distribution.
+        ValueError: If weights are not one non-negative value for each base value.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError("Distribution {!r} is not one of {}".format(distribution, ', '.join(map(repr, DISTRIBUTIONS))))
+    if weights is not None and distribution != 'uniform':
+        raise ValueError("Weights can only be used with the 'uniform' distribution")
+    cardinality = len(series(series_key))
+    if not math.isfinite(start):
+        raise ValueError("Start value {} is not finite".format(start))
+    if not math.isfinite(stop):
+        raise ValueError("Stop value {} is not finite".format(stop))
+    if not start <= stop:
+        raise ValueError("Start value {} must be less than stop value {}".format(start, stop))
+    table = series_table(series_key)
+    first = int(np.searchsorted(table, start, side='left'))
+    last = int(np.searchsorted(table, stop, side='right')) - 1
+    if first > last:
+        raise ValueError("There are no values in the range {} to {}".format(start, stop))
+    rng = np.random.default_rng(rng)
+
+    if distribution == 'log-uniform':
+        indices = _log_uniform_indices(table, first, last, size, rng)
+    elif weights is None:
+        indices = rng.integers(first, last + 1, size=size)
+    else:
+        indices = _weighted_indices(cardinality, first, last, size, rng, weights)
+    return table[indices]
+
+
+def _log_uniform_indices(table, first, last, size, rng):
+    # Each value owns the interval, on a logarithmic scale, up to the geometric
+    # means with its neighbours. Values drawn uniformly from the union of the
+    # intervals owned by the values in the range are snapped to their owners.
+    log_table = np.log10(table[max(first - 1, 0):last + 2])
+    offset = max(first - 1, 0)
+    low = log_table[first - offset]
+    high = log_table[last - offset]
+    if first != 0:
+        low = (low + log_table[first - 1 - offset]) / 2
+    if last != len(table) - 1 and np.isfinite(log_table[last + 1 - offset]):
+        high = (high + log_table[last + 1 - offset]) / 2
+    x = rng.uniform(low, high, size=size)
+    lower = np.searchsorted(log_table, x, side='right') - 1
+    upper = np.minimum(lower + 1, len(log_table) - 1)
+    nearer_upper = (log_table[upper] - x) < (x - log_table[lower])
+    indices = np.where(nearer_upper, upper, lower) + offset
+    return np.clip(indices, first, last)
+
+
+def _weighted_indices(cardinality, first, last, size, rng, weights):
+    weights = np.asarray(weights, dtype=np.float64)
+    if weights.shape != (cardinality,):
+        raise ValueError("There must be {} weights, one for each base value, not {}".format(
+            cardinality, weights.size))
+    if not np.all(np.isfinite(weights)) or np.any(weights < 0):
+        raise ValueError("Weights must be finite and non-negative")
+    # The table begins at the start of a decade, so the position of a value
+    # within its decade is its table index modulo the cardinality.
+    residues = np.arange(cardinality)
+    first_of_residue = first + (residues - first) % cardinality
+    count_of_residue = np.maximum((last - first_of_residue) // cardinality + 1, 0)
+    probabilities = weights * count_of_residue
+    total = probabilities.sum()
+    if total <= 0:
+        raise ValueError("The weights of the values in the range are all zero")
+    chosen = rng.choice(cardinality, size=size, p=probabilities / total)
+    decade_offsets = rng.integers(0, count_of_residue[chosen])
+    return first_of_residue[chosen] + decade_offsets * cardinality
@@ -0,0 +1,138 @@
+"""Lazy lookups over unbounded streams of values.
+
+Each function in this module consumes an iterable of query values in
+chunks, looks up each chunk with the batched functions in
+renard.vectorized, and yields the results one at a time, in the same
+order as the query values. At most one chunk is held in memory at a time,
+so the iterable may be unbounded.
+
+This module requires NumPy, which can be installed with the numpy extra:
+
+  $ pip install renard[numpy]
+"""
+
+from itertools import islice
+
+import numpy as np
+
+from renard import vectorized
+
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def nearest_iter(series_key, iterable, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lazily find the nearest values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        iterable: An iterable series of query values.
+        chunk_size: The number of query values to look up at once.
+
+    Yields:
+        The value in the specified Renard series closest to each query value.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _chunked(vectorized.find_nearest, series_key, iterable, chunk_size)
+
+
+def greater_than_or_equal_iter(series_key, iterable, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lazily find the smallest values greater-than or equal-to the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        iterable: An iterable series of query values.
+        chunk_size: The number of query values to look up at once.
+
+    Yields:
+        The smallest value from the specified series which is greater-than
+        or equal-to each query value.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _chunked(vectorized.find_greater_than_or_equal, series_key, iterable, chunk_size)
+
+
+def greater_than_iter(series_key, iterable, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lazily find the smallest values greater-than the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        iterable: An iterable series of query values.
+        chunk_size: The number of query values to look up at once.
+
+    Yields:
+        The smallest value from the specified series which is greater-than
+        each query value.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _chunked(vectorized.find_greater_than, series_key, iterable, chunk_size)
+
+
+def less_than_or_equal_iter(series_key, iterable, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lazily find the largest values less-than or equal-to the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        iterable: An iterable series of query values.
+        chunk_size: The number of query values to look up at once.
+
+    Yields:
+        The largest value from the specified series which is less-than
+        or equal-to each query value.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _chunked(vectorized.find_less_than_or_equal, series_key, iterable, chunk_size)
+
+
+def less_than_iter(series_key, iterable, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Lazily find the largest values less-than the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        iterable: An iterable series of query values.
+        chunk_size: The number of query values to look up at once.
+
+    Yields:
+        The largest value from the specified series which is less-than
+        each query value.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If chunk_size is not positive.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    return _chunked(vectorized.find_less_than, series_key, iterable, chunk_size)
+
+
+def _chunked(batch_func, series_key, iterable, chunk_size):
+    if chunk_size < 1:
+        raise ValueError("Chunk size {} is not positive".format(chunk_size))
+    return _generate_chunked(batch_func, series_key, iter(iterable), chunk_size)
+
+
+def _generate_chunked(batch_func, series_key, iterator, chunk_size):
+    while True:
+        chunk = np.fromiter(islice(iterator, chunk_size), dtype=np.float64)
+        if len(chunk) == 0:
+            return
+        yield from batch_func(series_key, chunk).tolist()
@@ -0,0 +1,281 @@
+"""Compiled lookup tables for the Renard series, and their binary snapshots.
+
+A compiled table holds every rounded value of a series over a contiguous
+range of decades, in ascending order, together with the log-mantissa table
+and geometric scale used by the scalar functions in renard.renard. Values
+are addressed by their step index, which is decade * cardinality + index.
+
+Compiling a table for the full floating-point range is comparatively slow,
+so tables can be saved into a compact binary snapshot with save_tables()
+and later loaded with load_tables(). Loaded tables are views onto a
+read-only memory-map of the snapshot, so loading costs the same regardless
+of how large the tables are, and processes which load the same snapshot
+share the same physical pages.
+"""
+
+import mmap
+import struct
+import sys
+import threading
+from array import array
+from math import floor, log10
+
+from renard.renard import (_MINIMUM_R_VALUE, LOG10_MANTISSA_E, GEOMETRIC_SCALE_E, _step_value, series,
+                           series_key_from_name)
+
+DEFAULT_START_DECADE = int(floor(log10(_MINIMUM_R_VALUE)))
+DEFAULT_STOP_DECADE = int(floor(log10(sys.float_info.max)))
+
+_MAGIC = b'RNRDTBL\0'
+_FORMAT_VERSION = 1
+_BYTE_ORDER_MARK = 0x01020304
+_HEADER = struct.Struct('=8sIII4x')
+_ENTRY = struct.Struct('=32sIiidQQ')
+_ITEM_SIZE = array('d').itemsize
+
+_tables = {}
+_tables_lock = threading.Lock()
+
+
+class CompiledTable:
+    """The values of a Renard series over a contiguous range of decades.
+
+    Attributes:
+        series_key: The series key for the table.
+        start_decade: The first decade included in the table.
+        stop_decade: The last decade included in the table.
+        log10_mantissa: A sequence of the base-ten logarithm mantissas
+            of the base values of the series.
+        geometric_scale: The largest ratio between successive values in
+            the series.
+        values: A sequence of floats containing the rounded series
+            values from the start decade to the stop decade inclusive,
+            from lowest to highest. Values too large to be represented
+            are infinite.
+    """
+
+    __slots__ = ('series_key', 'start_decade', 'stop_decade', 'log10_mantissa', 'geometric_scale', 'values')
+
+    def __init__(self, series_key, start_decade, stop_decade, log10_mantissa, geometric_scale, values):
+        cardinality = len(series(series_key))
+        if len(log10_mantissa) != cardinality:
+            raise ValueError("Mantissa table for {} has {} items, expected {}".format(
+                series_key, len(log10_mantissa), cardinality))
+        if len(values) != cardinality * (stop_decade - start_decade + 1):
+            raise ValueError("Values table for {} over decades {} to {} has {} items, expected {}".format(
+                series_key, start_decade, stop_decade, len(values),
+                cardinality * (stop_decade - start_decade + 1)))
+        self.series_key = series_key
+        self.start_decade = start_decade
+        self.stop_decade = stop_decade
+        self.log10_mantissa = log10_mantissa
+        self.geometric_scale = geometric_scale
+        self.values = values
+
+    @property
+    def cardinality(self):
+        return len(self.log10_mantissa)
+
+    @property
+    def first_step(self):
+        """The step index of the first value in the table."""
+        return self.start_decade * self.cardinality
+
+    @property
+    def last_step(self):
+        """The step index of the last value in the table."""
+        return (self.stop_decade + 1) * self.cardinality - 1
+
+    def __len__(self):
+        return len(self.values)
+
+    def value(self, step):
+        """The series value at the given step index.
+
+        Raises:
+            ValueError: If step is outside the table.
+        """
+        if not self.first_step <= step <= self.last_step:
+            raise ValueError("Step {} is outside the table for {} which spans steps {} to {}".format(
+                step, self.series_key, self.first_step, self.last_step))
+        return self.values[step - self.first_step]
+
+    def __repr__(self):
+        return "{}(series_key={!r}, start_decade={}, stop_decade={})".format(
+            type(self).__name__, self.series_key, self.start_decade, self.stop_decade)
+
+
+def compile_table(series_key, start_decade=DEFAULT_START_DECADE, stop_decade=DEFAULT_STOP_DECADE):
+    """Compile the lookup table for a series over a range of decades.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        start_decade: The first decade to include, as a power of ten.
+        stop_decade: The last decade to include, as a power of ten.
+
+    Returns:
+        A CompiledTable.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If start_decade is greater than stop_decade.
+        ValueError: If the decades are outside the representable range.
+    """
+    cardinality = len(series(series_key))
+    if not start_decade <= stop_decade:
+        raise ValueError("Start decade {} must be less than or equal to stop decade {}".format(
+            start_decade, stop_decade))
+    if start_decade < DEFAULT_START_DECADE or stop_decade > DEFAULT_STOP_DECADE:
+        raise ValueError("Decades must lie in the range {} to {}".format(
+            DEFAULT_START_DECADE, DEFAULT_STOP_DECADE))
+    values = array('d', (_step_value(series_key, step, cardinality)
+                         for step in range(start_decade * cardinality, (stop_decade + 1) * cardinality)))
+    return CompiledTable(series_key, start_decade, stop_decade,
+                         log10_mantissa=tuple(LOG10_MANTISSA_E[series_key]),
+                         geometric_scale=GEOMETRIC_SCALE_E[series_key],
+                         values=values)
+
+
+def compiled_table(series_key):
+    """The compiled table for a series.
+
+    The table loaded by load_tables() is used if there is one, otherwise
+    a table spanning the full range of decades is compiled on first use
+    and retained. The table is compiled only once, even if it is first
+    used by several threads at the same time.
+
+    Args:
+        series_key: An Renard series key such as R20.
+
+    Returns:
+        A CompiledTable.
+
+    Raises:
+        ValueError: If series_key is not known.
+    """
+    try:
+        return _tables[series_key]
+    except KeyError:
+        pass
+    with _tables_lock:
+        try:
+            return _tables[series_key]
+        except KeyError:
+            pass
+        table = compile_table(series_key)
+        _tables[series_key] = table
+        return table
+
+
+def discard_table(series_key):
+    """Discard the compiled or loaded table for a series, if there is one.
+
+    The table will be compiled again by compiled_table() when it is next
+    used.
+
+    Args:
+        series_key: An Renard series key such as R20.
+    """
+    with _tables_lock:
+        _tables.pop(series_key, None)
+
+
+def save_tables(path, tables):
+    """Save compiled tables into a binary snapshot.
+
+    The header and the tables are written in the native byte order, so
+    the snapshot can only be loaded on a platform with the same byte
+    order as the one that produced it.
+
+    Args:
+        path: The path of the file to be written.
+        tables: An iterable series of CompiledTable objects.
+    """
+    tables = list(tables)
+    offset = _HEADER.size + _ENTRY.size * len(tables)
+    entries = []
+    payloads = []
+    for table in tables:
+        offset = _aligned(offset)
+        mantissa_offset = offset
+        offset += _ITEM_SIZE * table.cardinality
+        values_offset = offset
+        offset += _ITEM_SIZE * len(table.values)
+        entries.append(_ENTRY.pack(
+            table.series_key.name.encode('utf-8'),
+            table.cardinality,
+            table.start_decade,
+            table.stop_decade,
+            table.geometric_scale,
+            mantissa_offset,
+            values_offset))
+        payloads.append((mantissa_offset, array('d', table.log10_mantissa).tobytes()))
+        payloads.append((values_offset, array('d', table.values).tobytes()))
+
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, _BYTE_ORDER_MARK, len(entries)))
+        for entry in entries:
+            f.write(entry)
+        for payload_offset, payload in payloads:
+            f.write(b'\0' * (payload_offset - f.tell()))
+            f.write(payload)
+
+
+def load_tables(path):
+    """Load compiled tables from a binary snapshot produced by save_tables().
+
+    The snapshot is memory-mapped read-only. Loaded tables which span
+    the full range of decades, from DEFAULT_START_DECADE to
+    DEFAULT_STOP_DECADE, replace any previously compiled or loaded tables
+    for the same series, so they will be used by compiled_table(). Tables
+    spanning fewer decades are returned, but are not used by
+    compiled_table().
+
+    Args:
+        path: The path of the snapshot file.
+
+    Returns:
+        A dictionary mapping series keys to CompiledTable objects.
+
+    Raises:
+        ValueError: If the file is not a snapshot compatible with this
+            version and platform.
+        ValueError: If the snapshot contains an unknown series.
+    """
+    with open(path, 'rb') as f:
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapping)
+    if len(view) < _HEADER.size:
+        raise ValueError("{} is not a Renard table snapshot".format(path))
+    magic, version, byte_order_mark, count = _HEADER.unpack_from(view)
+    if magic != _MAGIC:
+        raise ValueError("{} is not a Renard table snapshot".format(path))
+    if version != _FORMAT_VERSION:
+        raise ValueError("Renard table snapshot {} has version {}, expected {}".format(
+            path, version, _FORMAT_VERSION))
+    # A snapshot with the other byte order reads the mark back reversed
+    if byte_order_mark != _BYTE_ORDER_MARK or _ITEM_SIZE != 8:
+        raise ValueError("Renard table snapshot {} was produced on an incompatible platform".format(path))
+
+    tables = {}
+    for i in range(count):
+        (name, cardinality, start_decade, stop_decade,
+         geometric_scale, mantissa_offset, values_offset) = _ENTRY.unpack_from(view, _HEADER.size + i * _ENTRY.size)
+        series_key = series_key_from_name(name.rstrip(b'\0').decode('utf-8'))
+        num_values = cardinality * (stop_decade - start_decade + 1)
+        tables[series_key] = CompiledTable(
+            series_key, start_decade, stop_decade,
+            log10_mantissa=view[mantissa_offset:mantissa_offset + _ITEM_SIZE * cardinality].cast('d'),
+            geometric_scale=geometric_scale,
+            values=view[values_offset:values_offset + _ITEM_SIZE * num_values].cast('d'))
+    with _tables_lock:
+        _tables.update((series_key, table) for series_key, table in tables.items() if _is_complete(table))
+    return tables
+
+
+def _is_complete(table):
+    return table.start_decade == DEFAULT_START_DECADE and table.stop_decade == DEFAULT_STOP_DECADE
+
+
+def _aligned(offset, alignment=_ITEM_SIZE):
+    return -(-offset // alignment) * alignment
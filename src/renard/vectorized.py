@@ -0,0 +1,443 @@
+"""Batched lookups over arrays of values, using NumPy.
+
+The functions in this module correspond to the scalar functions of the
+same names in renard.renard, but accept an array-like of query values and
+return a NumPy array of results with the same shape. The results are
+identical to those of the scalar functions, because they are selected
+from the compiled tables in renard.tables rather than computed afresh.
+
+The lookups are performed by one of two backends: 'numpy', which uses
+whole-array NumPy operations, and 'numba', which uses the kernels in
+renard.jit compiled with Numba. The 'numba' backend is used if Numba is
+installed, otherwise the 'numpy' backend is used. Both backends give
+identical results. A backend can be selected explicitly with set_backend().
+
+This module requires NumPy, which can be installed with the numpy extra:
+
+  $ pip install renard[numpy]
+"""
+
+import importlib
+import numbers
+
+import numpy as np
+
+from renard.renard import _MINIMUM_R_VALUE, _step_value, series
+from renard.tables import compiled_table
+
+_BACKEND_MODULES = {
+    'numpy': 'renard._numpy_kernels',
+    'numba': 'renard.jit',
+}
+
+_backend = None
+_kernels = None
+
+
+def available_backends():
+    """The names of the backends which can be used in this environment.
+
+    Returns:
+        A tuple of backend names.
+    """
+    names = []
+    for name, module_name in _BACKEND_MODULES.items():
+        try:
+            importlib.import_module(module_name)
+        except ImportError:
+            continue
+        names.append(name)
+    return tuple(names)
+
+
+def get_backend():
+    """The name of the backend in use, either 'numpy' or 'numba'."""
+    _get_kernels()
+    return _backend
+
+
+def set_backend(name=None):
+    """Select the backend used for lookups.
+
+    Args:
+        name: Either 'numpy' or 'numba', or None to select 'numba' if it
+            is available, and otherwise 'numpy'.
+
+    Raises:
+        ValueError: If name is not a known backend.
+        ImportError: If the backend is not available.
+    """
+    global _backend, _kernels
+    if name is None:
+        try:
+            kernels = importlib.import_module(_BACKEND_MODULES['numba'])
+            name = 'numba'
+        except ImportError:
+            kernels = importlib.import_module(_BACKEND_MODULES['numpy'])
+            name = 'numpy'
+    else:
+        try:
+            module_name = _BACKEND_MODULES[name]
+        except KeyError:
+            raise ValueError("Backend {!r} not found. Available backends are {}"
+                             .format(name, ', '.join(map(repr, _BACKEND_MODULES))))
+        kernels = importlib.import_module(module_name)
+    _backend, _kernels = name, kernels
+
+
+def _get_kernels():
+    if _kernels is None:
+        set_backend()
+    return _kernels
+
+
+def find_greater_than_or_equal(series_key, values):
+    """Find the smallest values greater-than or equal-to the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+
+    Returns:
+        An array of the smallest values from the specified series which
+        are greater-than or equal-to the query values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    table, x = _prepare(series_key, values)
+    indices = _lookup(_get_kernels().greater_than_or_equal_indices, table, x)
+    return table[indices]
+
+
+def find_greater_than(series_key, values):
+    """Find the smallest values greater-than the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+
+    Returns:
+        An array of the smallest values from the specified series which
+        are greater-than the query values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    table, x = _prepare(series_key, values)
+    indices = _lookup(_get_kernels().greater_than_indices, table, x)
+    return table[indices]
+
+
+def find_less_than_or_equal(series_key, values):
+    """Find the largest values less-than or equal-to the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+
+    Returns:
+        An array of the largest values from the specified series which
+        are less-than or equal-to the query values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    table, x = _prepare(series_key, values)
+    indices = _lookup(_get_kernels().less_than_or_equal_indices, table, x)
+    return table[indices]
+
+
+def find_less_than(series_key, values):
+    """Find the largest values less-than the given values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+
+    Returns:
+        An array of the largest values from the specified series which
+        are less-than the query values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    table, x = _prepare(series_key, values)
+    indices = _lookup(_get_kernels().less_than_indices, table, x)
+    return table[indices]
+
+
+def find_nearest(series_key, values):
+    """Find the nearest values.
+
+    Where a value is equidistant from two series values, the lower is
+    chosen, as with the scalar find_nearest().
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+
+    Returns:
+        An array of the values from the specified series closest to the
+        query values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    table, x = _prepare(series_key, values)
+    indices = _lookup(_get_kernels().nearest_indices, table, x)
+    return table[indices]
+
+
+def find_nearest_step(series_key, values):
+    """Find the step indexes of the nearest values.
+
+    The step index of a value is decade * cardinality + index, where index is
+    the position of its base value within the series.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+
+    Returns:
+        An integer array of the step indexes of the values from the specified
+        series closest to the query values.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    table, x = _prepare(series_key, values)
+    indices = _lookup(_get_kernels().nearest_indices, table, x)
+    return indices + compiled_table(series_key).first_step
+
+
+def value_at_step(series_key, steps):
+    """The series values at the given step indexes.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        steps: An array-like of integer step indexes.
+
+    Returns:
+        An array of the values at the step indexes.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any step index is out of range.
+    """
+    table = series_table(series_key)
+    steps = np.asarray(steps, dtype=np.int64)
+    indices = steps - compiled_table(series_key).first_step
+    out_of_range = (indices < 0) | (indices >= len(table))
+    out_of_range[~out_of_range] = np.isinf(table[indices[~out_of_range]])
+    if np.any(out_of_range):
+        raise ValueError("Step {} is out of range".format(steps[out_of_range].flat[0]))
+    return table[indices]
+
+
+def count_rrange(series_key, start, stop):
+    """Count the values in inclusive ranges.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        start: An array-like of the beginnings of the ranges.
+        stop: An array-like of the ends of the ranges, which will be
+            broadcast against start.
+
+    Returns:
+        An integer array of the number of values which rrange() would
+        generate for each range.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If any start or stop value is not finite.
+        ValueError: If any start value is not less-than or equal-to the
+            corresponding stop value.
+    """
+    table, start = _prepare(series_key, start)
+    _, stop = _prepare(series_key, stop)
+    start, stop = np.broadcast_arrays(start, stop)
+    if np.any(start > stop):
+        raise ValueError("Start value {} must be less than stop value {}".format(
+            start[start > stop].flat[0], stop[start > stop].flat[0]))
+    counts = _get_kernels().count_in_range(table, np.ravel(start), np.ravel(stop))
+    return counts.reshape(start.shape)
+
+
+def within_tolerance(series_key, values, rel_tol):
+    """Find all of the series values within a relative tolerance of each value.
+
+    For each query value x, the values found are those which rrange()
+    would generate from x * (1 - rel_tol) to x * (1 + rel_tol) inclusive.
+    The bounds of each band are found by binary search of the compiled
+    table, so the cost does not depend on how many values the bands hold.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values, which is flattened.
+        rel_tol: The relative tolerance, at least zero and less than one.
+
+    Returns:
+        A tuple (found, offsets) in compressed sparse row form, where found
+        is an array of all of the series values found, and offsets is an
+        integer array one longer than the number of query values. The values
+        within tolerance of the i-th query value are found[offsets[i]:offsets[i + 1]],
+        from lowest to highest.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If rel_tol is not at least zero and less than one.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    if not 0 <= rel_tol < 1:
+        raise ValueError("Relative tolerance {} is not at least zero and less than one".format(rel_tol))
+    table, x = _prepare(series_key, values)
+    x = np.ravel(x)
+    kernels = _get_kernels()
+    with np.errstate(over='ignore'):
+        high = x * (1 + rel_tol)
+    first = kernels.greater_than_or_equal_indices(table, x * (1 - rel_tol))
+    stop = kernels.greater_than_indices(table, high)
+    # Values too large to be represented are infinite in the table
+    stop = np.minimum(stop, np.searchsorted(table, np.inf, side='left'))
+    counts = np.maximum(stop - first, 0)
+    offsets = np.zeros(len(x) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    # The table index of each value found is the first index of its band
+    # plus its position within the band
+    indices = np.repeat(first - offsets[:-1], counts) + np.arange(offsets[-1])
+    return table[indices], offsets
+
+
+def find_nearest_few(series_key, values, num=3, order='value'):
+    """Find the nearest values.
+
+    Args:
+        series_key: An Renard series key such as R20.
+        values: An array-like of query values.
+        num: The number of nearby values to find for each query value,
+            which must be at least one.
+        order: 'value' to order the results from lowest to highest, or
+            'distance' to order them from nearest to furthest.
+
+    Returns:
+        An array with an additional trailing axis of length num, containing
+        the same values as the scalar find_nearest_few() for each query
+        value.
+
+    Raises:
+        ValueError: If series_key is not known.
+        ValueError: If num is not a positive integer.
+        ValueError: If order is not 'value' or 'distance'.
+        ValueError: If any value is not finite.
+        ValueError: If any value is out of range.
+    """
+    if not isinstance(num, numbers.Integral) or num < 1:
+        raise ValueError("num {} is not a positive integer".format(num))
+    if order not in _ORDERS:
+        raise ValueError("order {!r} is not one of {}".format(order, ', '.join(map(repr, _ORDERS))))
+    table, x = _prepare(series_key, values)
+    # The value below the table is out of range, but the scalar function
+    # compares against it, so growing the window onto it must be detected
+    first_step = compiled_table(series_key).first_step
+    below = _step_value(series_key, first_step - 1, len(series(series_key)))
+    # The nearest values form a contiguous window of the table, which is
+    # grown one step at a time from the largest value less-than or equal-to x.
+    lower = np.searchsorted(table, x, side='right') - 1
+    upper = lower + 1
+    for _ in range(num):
+        take_lower = x - _padded(table, lower, below) <= _padded(table, upper) - x
+        lower = np.where(take_lower, lower - 1, lower)
+        upper = np.where(take_lower, upper, upper + 1)
+    first = lower + 1
+    if num >= 3:
+        # Ensure the window straddles x
+        first = np.where(_padded(table, first + num - 1) <= x, first + 1, first)
+        first = np.where(_padded(table, first) >= x, first - 1, first)
+    _check_indices(first, table, x)
+    _check_indices(first + num - 1, table, x)
+    nearest = table[first[..., np.newaxis] + np.arange(num)]
+    if order == 'distance':
+        distances = np.abs(nearest - x[..., np.newaxis])
+        nearest = np.take_along_axis(nearest, np.argsort(distances, axis=-1, kind='stable'), axis=-1)
+    return nearest
+
+
+_ORDERS = ('value', 'distance')
+
+
+def _padded(table, indices, below=-np.inf):
+    """Look up indices in the table, treating index -1 as below, indices below that as -inf,
+    and indices beyond the end as +inf."""
+    clipped = np.clip(indices, 0, len(table) - 1)
+    padded = np.where(indices >= len(table), np.inf, table[clipped])
+    return np.where(indices < 0, np.where(indices == -1, below, -np.inf), padded)
+
+
+def series_table(series_key):
+    """The compiled table of a series as an array.
+
+    Args:
+        series_key: An Renard series key such as R20.
+
+    Returns:
+        A read-only array of all of the values of the series, from lowest
+        to highest, ending with infinities in place of any values too
+        large to be represented. The index of a value in the array plus the first step
+        index of the compiled table is the step index of the value.
+
+    Raises:
+        ValueError: If series_key is not known.
+    """
+    return np.frombuffer(compiled_table(series_key).values, dtype=np.float64)
+
+
+def _apply_skipping_nan(func, series_key, x, fill=np.nan, dtype=np.float64):
+    """Apply a batched lookup function to the values of x which are not NaN.
+
+    Returns:
+        A tuple of the result array, with fill in place of NaN, and the boolean
+        array marking the NaN values.
+    """
+    missing = np.isnan(x)
+    result = np.full(x.shape, fill, dtype=dtype)
+    result[~missing] = func(series_key, x[~missing])
+    return result, missing
+
+
+def _prepare(series_key, values):
+    table = series_table(series_key)
+    x = np.asarray(values, dtype=np.float64)
+    if not np.all(np.isfinite(x)):
+        raise ValueError("Value {} is not finite".format(x[~np.isfinite(x)].flat[0]))
+    if np.any(x < _MINIMUM_R_VALUE):
+        raise ValueError("{} is too small. The value must greater than or equal to {}".format(
+            x[x < _MINIMUM_R_VALUE].flat[0], _MINIMUM_R_VALUE))
+    return table, x
+
+
+def _lookup(kernel, table, x):
+    indices = kernel(table, np.ravel(x)).reshape(x.shape)
+    _check_indices(indices, table, x)
+    return indices
+
+
+def _check_indices(indices, table, x):
+    # Values too large to be represented are infinite in the table
+    out_of_range = (indices < 0) | (indices >= len(table))
+    out_of_range[~out_of_range] = np.isinf(table[indices[~out_of_range]])
+    if np.any(out_of_range):
+        raise ValueError("Value {} is out of range".format(x[out_of_range].flat[0]))
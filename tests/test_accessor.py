@@ -0,0 +1,100 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+pd = pytest.importorskip("pandas")
+
+import renard.accessor  # noqa: F401 Registers the accessor
+from renard.renard import R10, R20, find_nearest, find_greater_than
+
+
+def test_series_nearest():
+    s = pd.Series([319.0, 5000.0, 37726.0], index=['a', 'b', 'c'], name='r')
+    result = s.renard.nearest(R20)
+    assert result.tolist() == [315.0, 5000.0, 35500.0]
+    assert result.index.tolist() == ['a', 'b', 'c']
+    assert result.name == 'r'
+    assert result.dtype == np.float64
+
+
+def test_series_nan_is_passed_through():
+    result = pd.Series([319.0, np.nan]).renard.nearest(R20)
+    assert result[0] == 315.0
+    assert np.isnan(result[1])
+
+
+def test_series_infinity_raises_value_error():
+    with pytest.raises(ValueError):
+        pd.Series([319.0, np.inf]).renard.nearest(R20)
+
+
+def test_series_nullable_dtype_is_preserved():
+    result = pd.Series([31, None], dtype='Int64').renard.ge(R10)
+    assert result.dtype == 'Float64'
+    assert result[0] == 31.5
+    assert result[1] is pd.NA
+
+
+def test_series_directional_lookups_match_scalar():
+    values = [3.0, 31.5, 0.02, 7.7e9]
+    s = pd.Series(values)
+    assert s.renard.gt(R20).tolist() == [find_greater_than(R20, v) for v in values]
+    assert s.renard.ge(R20).tolist() == [3.15, 31.5, 0.02, 8e9]
+    assert s.renard.le(R20).tolist() == [2.8, 31.5, 0.02, 7.1e9]
+    assert s.renard.lt(R20).tolist() == [2.8, 28.0, 0.018, 7.1e9]
+
+
+def test_series_index():
+    result = pd.Series([1.0, 21.0, None]).renard.index(R10)
+    assert result.dtype == 'Int64'
+    assert result[:2].tolist() == [0, 13]
+    assert result[2] is pd.NA
+
+
+def test_series_format():
+    result = pd.Series([315.0, 35500.0, None, 315.0]).renard.format()
+    assert result[:2].tolist() == ['315', '35.5 k']
+    assert pd.isna(result[2])
+    assert result[3] == '315'
+
+
+def test_arrow_backed_series_stays_arrow_backed():
+    pa = pytest.importorskip("pyarrow")
+    s = pd.Series(pa.array([319.0, None]), dtype=pd.ArrowDtype(pa.float64()))
+    result = s.renard.nearest(R20)
+    assert isinstance(result.dtype, pd.ArrowDtype)
+    assert result[0] == 315.0
+    assert result[1] is pd.NA
+
+
+def test_dataframe_snaps_numeric_columns():
+    df = pd.DataFrame({'part': ['x', 'y'], 'r': [319.0, 21.0], 'c': [4.4, np.nan]})
+    result = df.renard.nearest(R20)
+    assert result['part'].tolist() == ['x', 'y']
+    assert result['r'].tolist() == [find_nearest(R20, 319.0), find_nearest(R20, 21.0)]
+    assert result['c'][0] == 4.5
+    assert np.isnan(result['c'][1])
+
+
+def test_dataframe_snaps_chosen_columns():
+    df = pd.DataFrame({'r': [319.0], 'c': [4.4]})
+    result = df.renard.nearest(R20, columns=['r'])
+    assert result['r'].tolist() == [315.0]
+    assert result['c'].tolist() == [4.4]
+
+
+def test_arrow_backed_series_index_stays_arrow_backed():
+    pa = pytest.importorskip("pyarrow")
+    s = pd.Series(pa.array([21.0, None]), dtype=pd.ArrowDtype(pa.float64()))
+    result = s.renard.index(R10)
+    assert isinstance(result.dtype, pd.ArrowDtype)
+    assert result[0] == 13
+    assert result[1] is pd.NA
+
+
+def test_dataframe_directional_lookups_and_index():
+    df = pd.DataFrame({'r': [3.0, 31.5]})
+    assert df.renard.ge(R20)['r'].tolist() == [3.15, 31.5]
+    assert df.renard.gt(R20)['r'].tolist() == [3.15, 35.5]
+    assert df.renard.le(R20)['r'].tolist() == [2.8, 31.5]
+    assert df.renard.lt(R20)['r'].tolist() == [2.8, 28.0]
+    assert df.renard.index(R10)['r'].tolist() == [5, 15]
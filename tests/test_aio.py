@@ -0,0 +1,190 @@
+import asyncio
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import sampled_from, floats, lists, integers
+from pytest import raises
+
+np = pytest.importorskip("numpy")
+
+from renard import aio, vectorized
+from renard.renard import RenardSeriesKey, R10, R80, rrange
+
+FINDERS = {
+    'nearest_many': 'find_nearest',
+    'greater_than_or_equal_many': 'find_greater_than_or_equal',
+    'greater_than_many': 'find_greater_than',
+    'less_than_or_equal_many': 'find_less_than_or_equal',
+    'less_than_many': 'find_less_than',
+    'nearest_step_many': 'find_nearest_step',
+}
+
+
+async def _collect(aiterable):
+    return [value async for value in aiterable]
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       values=lists(floats(min_value=1e-35, max_value=1e35), min_size=1, max_size=50),
+       chunk_size=integers(min_value=1, max_value=8),
+       name=sampled_from(sorted(FINDERS)))
+def test_many_matches_vectorized(series_key, values, chunk_size, name):
+    result = asyncio.run(getattr(aio, name)(series_key, values, chunk_size=chunk_size))
+    assert result.tolist() == getattr(vectorized, FINDERS[name])(series_key, values).tolist()
+
+
+def test_many_with_given_executor_preserves_shape():
+    async def lookup():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return await aio.nearest_many(R10, [[21, 31], [41, 51]], executor=executor, chunk_size=1)
+    assert asyncio.run(lookup()).tolist() == [[20.0, 31.5], [40.0, 50.0]]
+
+
+def test_small_many_runs_inline():
+    class FailingExecutor:
+        def submit(self, *args, **kwargs):
+            raise AssertionError("The executor was used")
+
+    result = asyncio.run(aio.nearest_many(R10, [21, 31], executor=FailingExecutor()))
+    assert result.tolist() == [20.0, 31.5]
+
+
+def test_many_out_of_range_raises_value_error():
+    with raises(ValueError):
+        asyncio.run(aio.less_than_many(R10, [1.0, 2.0, 3.0, 1e-300], chunk_size=1))
+
+
+def test_many_illegal_chunk_size_raises_value_error():
+    with raises(ValueError):
+        asyncio.run(aio.nearest_many(R10, [1.0], chunk_size=0))
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       start=floats(min_value=1e-10, max_value=1e10),
+       decades=integers(min_value=0, max_value=4),
+       chunk_size=integers(min_value=1, max_value=50),
+       reverse=sampled_from([False, True]))
+def test_rrange_matches_rrange(series_key, start, decades, chunk_size, reverse):
+    stop = start * 10 ** decades
+    result = asyncio.run(_collect(aio.rrange(series_key, start, stop, reverse=reverse, chunk_size=chunk_size)))
+    assert result == list(rrange(series_key, start, stop, reverse=reverse))
+
+
+def test_rrange_exact_matches_rrange():
+    result = asyncio.run(_collect(aio.rrange(R10, 1, 1000, exact=True, chunk_size=4)))
+    assert result == list(rrange(R10, 1, 1000, exact=True))
+
+
+def test_rrange_illegal_arguments_raise_value_error_immediately():
+    with raises(ValueError):
+        aio.rrange(R10, 10, 1)
+
+
+def test_rrange_yields_control_between_chunks():
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(None)
+            await asyncio.sleep(0)
+
+    async def enumerate_range():
+        ticker = asyncio.ensure_future(tick())
+        try:
+            return await _collect(aio.rrange(R80, 1e-10, 1e10, chunk_size=100))
+        finally:
+            ticker.cancel()
+
+    values = asyncio.run(enumerate_range())
+    assert len(values) == 1601
+    assert len(ticks) >= 10
+
+
+def test_many_cancellation_stops_remaining_chunks():
+    started = []
+    release = threading.Event()
+
+    def blocking_finder(series_key, x):
+        started.append(len(x))
+        release.wait()
+        return vectorized.find_nearest(series_key, x)
+
+    async def cancel_lookup():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            task = asyncio.ensure_future(
+                aio._offload(blocking_finder, R10, np.full(100, 21.0), executor, chunk_size=10))
+            while not started:
+                await asyncio.sleep(0.001)
+            task.cancel()
+            release.set()
+            with raises(asyncio.CancelledError):
+                await task
+
+    asyncio.run(cancel_lookup())
+    assert started == [10]
+
+
+def test_rrange_illegal_chunk_size_raises_value_error():
+    with raises(ValueError):
+        aio.rrange(R10, 1, 10, chunk_size=0)
+
+
+def test_less_than_many_matches_vectorized():
+    result = asyncio.run(aio.less_than_many(R10, [21.0, 31.5], chunk_size=1))
+    assert result.tolist() == [20.0, 25.0]
+
+
+def test_rrange_break_mid_stream_closes_range():
+    async def take_some():
+        values = aio.rrange(R80, 1e-10, 1e10, chunk_size=100)
+        collected = []
+        async for value in values:
+            collected.append(value)
+            if len(collected) == 150:
+                break
+        await values.aclose()
+        return collected
+
+    assert asyncio.run(take_some()) == list(rrange(R80, 1e-10, 1e10))[:150]
+
+
+def test_range_cancellation_closes_generator_after_chunk():
+    started = threading.Event()
+    release = threading.Event()
+    closed = []
+
+    def generate():
+        try:
+            for i in itertools.count():
+                if i == 2:
+                    started.set()
+                    release.wait()
+                yield i
+        finally:
+            closed.append(i)
+
+    # Holding a reference means that only an explicit close will finish the generator
+    values = generate()
+
+    async def consume(executor):
+        return [value async for value in aio._arange(values, False, executor, chunk_size=2)]
+
+    async def cancel_iteration():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            task = asyncio.ensure_future(consume(executor))
+            while not started.is_set():
+                await asyncio.sleep(0.001)
+            task.cancel()
+            await asyncio.sleep(0.01)
+            assert closed == []
+            release.set()
+            with raises(asyncio.CancelledError):
+                await task
+            assert closed == [3]
+
+    asyncio.run(cancel_iteration())
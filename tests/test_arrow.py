@@ -0,0 +1,49 @@
+import pytest
+
+pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+
+from renard import arrow
+from renard.renard import R10, R20
+
+
+def test_array_nearest_with_nulls():
+    result = arrow.find_nearest(R20, pa.array([319.0, None, 37726.0]))
+    assert result.type == pa.float64()
+    assert result.to_pylist() == [315.0, None, 35500.0]
+
+
+def test_array_nan_is_passed_through():
+    result = arrow.find_nearest(R20, pa.array([float('nan'), 4.4]))
+    assert result.null_count == 0
+    assert result.to_pylist()[1] == 4.5
+
+
+def test_integer_array_is_accepted():
+    result = arrow.find_greater_than_or_equal(R10, pa.array([31, None], type=pa.int32()))
+    assert result.to_pylist() == [31.5, None]
+
+
+def test_chunked_array_keeps_chunks():
+    chunked = pa.chunked_array([[1.1, 2.1], [None, 3.1]])
+    result = arrow.find_less_than(R10, chunked)
+    assert isinstance(result, pa.ChunkedArray)
+    assert result.num_chunks == 2
+    assert result.to_pylist() == [1.0, 2.0, None, 2.5]
+
+
+def test_directional_lookups():
+    values = pa.array([31.5])
+    assert arrow.find_greater_than(R20, values).to_pylist() == [35.5]
+    assert arrow.find_less_than_or_equal(R20, values).to_pylist() == [31.5]
+
+
+def test_nearest_step_with_nulls():
+    result = arrow.find_nearest_step(R10, pa.array([21.0, None]))
+    assert result.type == pa.int64()
+    assert result.to_pylist() == [13, None]
+
+
+def test_out_of_range_raises_value_error():
+    with pytest.raises(ValueError):
+        arrow.find_less_than(R10, pa.array([1e-300]))
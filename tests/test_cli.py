@@ -1,6 +1,16 @@
+import io
+import json
 import os
+import runpy
+import struct
+import sys
 
+import pytest
+
+import renard
 from renard.cli import main
+from renard.eng import eng_string
+from renard.renard import R80, find_nearest, rrange
 
 
 def test_nearest(capfd):
@@ -73,6 +83,157 @@ def test_range_R10_symbol(capfd):
     assert out == "2 k\n2.5 k\n3.15 k\n"
 
 
+def test_range_R10_json(capfd):
+    code = main("range R10 1700 3400 --format=json".split())
+    out, err = capfd.readouterr()
+    assert code == os.EX_OK
+    assert json.loads(out) == [2000.0, 2500.0, 3150.0]
+
+
+def test_range_R10_empty_json(capfd):
+    code = main("range R10 1700 1900 --format=json".split())
+    out, err = capfd.readouterr()
+    assert code == os.EX_OK
+    assert json.loads(out) == []
+
+
+def test_range_R10_csv(capfd):
+    code = main("range R10 1700 3400 --format=csv".split())
+    out, err = capfd.readouterr()
+    assert code == os.EX_OK
+    assert out == "value\n2000.0\n2500.0\n3150.0\n"
+
+
+def test_range_R10_raw(capfdbinary):
+    code = main("range R10 1700 3400 --format=raw".split())
+    out, err = capfdbinary.readouterr()
+    assert code == os.EX_OK
+    assert struct.unpack('<3d', out) == (2000.0, 2500.0, 3150.0)
+
+
+def test_range_R80_npy(capfdbinary):
+    np = pytest.importorskip("numpy")
+    code = main("range R80 1e-3 1e3 --format=npy".split())
+    out, err = capfdbinary.readouterr()
+    assert code == os.EX_OK
+    assert np.load(io.BytesIO(out)).tolist() == list(rrange(R80, 1e-3, 1e3))
+
+
+def test_range_wide_text_matches_rrange(capfd):
+    code = main("range R80 1e-30 1e30".split())
+    out, err = capfd.readouterr()
+    assert code == os.EX_OK
+    assert out.splitlines() == [eng_string(value, prefix=False) for value in rrange(R80, 1e-30, 1e30)]
+
+
+@pytest.mark.parametrize('format_name', ['json', 'csv'])
+def test_range_reversed_writes_nothing(capfd, format_name):
+    code = main("range R10 3400 1700 --format={}".format(format_name).split())
+    out, err = capfd.readouterr()
+    assert code == os.EX_DATAERR
+    assert out == ""
+    assert err != ""
+
+
+def test_range_bogus_format_gives_exit_code_ex_dataerr():
+    code = main("range R10 1700 3400 --format=xml".split())
+    assert code == os.EX_DATAERR
+
+
+MAP_CSV = "part,resistance,capacitance\nR1,319,4.6e-9\nR2,,1e-6\nR3,37726,5.2e-9\n"
+
+
+def test_map_adds_columns(capfd, tmp_path):
+    pytest.importorskip("numpy")
+    path = tmp_path / "parts.csv"
+    path.write_text(MAP_CSV)
+    code = main(["map", "R20", "resistance", "capacitance", "--input={}".format(path)])
+    out, err = capfd.readouterr()
+    assert code == os.EX_OK
+    assert out == ("part,resistance,capacitance,resistance_R20,capacitance_R20\n"
+                   "R1,319,4.6e-9,315.0,4.5e-09\n"
+                   "R2,,1e-6,,1e-06\n"
+                   "R3,37726,5.2e-9,35500.0,5e-09\n")
+
+
+def test_map_in_place_in_chunks_from_stdin(capfd, monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr('sys.stdin', io.StringIO(MAP_CSV))
+    code = main("map R10 resistance --in-place --mode=ge --chunk-size=1".split())
+    out, err = capfd.readouterr()
+    assert code == os.EX_OK
+    assert out == ("part,resistance,capacitance\n"
+                   "R1,400.0,4.6e-9\n"
+                   "R2,,1e-6\n"
+                   "R3,40000.0,5.2e-9\n")
+
+
+def test_map_matches_nearest_for_many_rows(capfd, tmp_path):
+    pytest.importorskip("numpy")
+    values = [1.1 ** n for n in range(-100, 100)]
+    path = tmp_path / "values.csv"
+    path.write_text("value\n" + "".join("{!r}\n".format(value) for value in values))
+    code = main(["map", "R80", "value", "--suffix=.snapped", "--chunk-size=7", "--input={}".format(path)])
+    out, err = capfd.readouterr()
+    assert code == os.EX_OK
+    lines = out.splitlines()
+    assert lines[0] == "value,value.snapped"
+    assert [float(line.split(",")[1]) for line in lines[1:]] == [find_nearest(R80, value) for value in values]
+
+
+def test_map_missing_column_gives_exit_code_ex_dataerr(monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr('sys.stdin', io.StringIO(MAP_CSV))
+    code = main("map R10 inductance".split())
+    assert code == os.EX_DATAERR
+
+
+def test_map_bogus_value_gives_exit_code_ex_dataerr(monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr('sys.stdin', io.StringIO("value\n100\nFOO\n"))
+    code = main("map R10 value".split())
+    assert code == os.EX_DATAERR
+
+
+def test_map_bogus_mode_gives_exit_code_ex_dataerr(monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr('sys.stdin', io.StringIO(MAP_CSV))
+    code = main("map R10 resistance --mode=closest".split())
+    assert code == os.EX_DATAERR
+
+
+def test_map_empty_input_writes_nothing(capfd, monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr('sys.stdin', io.StringIO(""))
+    code = main("map R10 resistance".split())
+    out, err = capfd.readouterr()
+    assert code == os.EX_OK
+    assert out == ""
+
+
+def test_map_short_row_gives_exit_code_ex_dataerr(monkeypatch):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr('sys.stdin', io.StringIO("part,resistance\nR1,100\nR2\n"))
+    code = main("map R10 resistance".split())
+    assert code == os.EX_DATAERR
+
+
+@pytest.mark.parametrize("chunk_size", ["0", "many"])
+def test_map_bogus_chunk_size_gives_exit_code_ex_dataerr(monkeypatch, chunk_size):
+    pytest.importorskip("numpy")
+    monkeypatch.setattr('sys.stdin', io.StringIO(MAP_CSV))
+    code = main(["map", "R10", "resistance", "--chunk-size={}".format(chunk_size)])
+    assert code == os.EX_DATAERR
+
+
+def test_map_without_numpy_gives_exit_code_ex_unavailable(monkeypatch):
+    monkeypatch.setitem(sys.modules, 'renard.vectorized', None)
+    monkeypatch.delattr(renard, 'vectorized', raising=False)
+    monkeypatch.setattr('sys.stdin', io.StringIO(MAP_CSV))
+    code = main("map R10 resistance".split())
+    assert code == os.EX_UNAVAILABLE
+
+
 def test_bogus_r_series_gives_exit_code_ex_dataerr():
     code = main("series R13".split())
     assert code == os.EX_DATAERR
@@ -97,3 +258,12 @@ def test_precision(capfd):
 def test_bogus_r_series_precision_gives_exit_code_ex_dataerr():
     code = main("series R13".split())
     assert code == os.EX_DATAERR
+
+
+def test_run_as_module(monkeypatch, capfd):
+    monkeypatch.setattr(sys, 'argv', ['renard', 'nearest', 'R10', '21'])
+    with pytest.raises(SystemExit) as exc_info:
+        runpy.run_module('renard', run_name='__main__')
+    assert exc_info.value.code == os.EX_OK
+    out, err = capfd.readouterr()
+    assert out == "20\n"
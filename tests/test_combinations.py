@@ -0,0 +1,114 @@
+import itertools
+import math
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import sampled_from, floats, integers
+from pytest import raises
+
+from renard.combinations import CombinationSearch, KINDS, find_combinations
+from renard.renard import RenardSeriesKey, R10
+
+
+def _brute_force_errors(values, target, kind, num):
+    combined = (a + b if kind == 'series' else 1 / (1 / a + 1 / b)
+                for a, b in itertools.combinations_with_replacement(values, 2))
+    return sorted(abs(value - target) / target for value in combined)[:num]
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       target=floats(min_value=2.0, max_value=900.0),
+       kind=sampled_from(KINDS),
+       num=integers(min_value=1, max_value=10))
+def test_find_matches_brute_force(series_key, target, kind, num):
+    search = CombinationSearch(series_key, 1.0, 1000.0)
+    combinations = search.find(target, kind, num)
+    expected = _brute_force_errors(search.values, target, kind, num)
+    assert len(combinations) == len(expected)
+    for combination, error in zip(combinations, expected):
+        assert math.isclose(abs(combination.error), error, rel_tol=1e-9, abs_tol=1e-15)
+
+
+@settings(deadline=None)
+@given(target=floats(min_value=2.0, max_value=900.0),
+       kind=sampled_from(KINDS))
+def test_combinations_are_ordered_and_consistent(target, kind):
+    combinations = CombinationSearch(R10, 1.0, 1000.0).find(target, kind, num=5)
+    errors = [abs(combination.error) for combination in combinations]
+    assert errors == sorted(errors)
+    for a, b, combination_kind, value, error in combinations:
+        assert a <= b
+        assert combination_kind == kind
+        assert value == (a + b if kind == 'series' else 1 / (1 / a + 1 / b))
+        assert error == (value - target) / target
+
+
+def test_find_parallel_combination_of_small_values():
+    combination = find_combinations(R10, 1e-199, kind='parallel')[0]
+    assert math.isclose(combination.value, 1e-199, rel_tol=1e-9)
+    assert abs(combination.error) < 1e-9
+
+
+def test_find_exact_series_combination():
+    combination = find_combinations(R10, 500, kind='series')[0]
+    assert combination.value == 500.0
+    assert combination.error == 0.0
+
+
+def test_find_exact_parallel_combination():
+    combination = find_combinations(R10, 50, kind='parallel')[0]
+    assert combination.value == 50.0
+    assert combination.error == 0.0
+
+
+def test_find_many_matches_find():
+    search = CombinationSearch(R10, 10, 10000)
+    targets = [47, 220, 3300]
+    assert search.find_many(targets, 'parallel', 3) == [search.find(target, 'parallel', 3) for target in targets]
+
+
+def test_find_returns_every_pair_when_num_is_large():
+    search = CombinationSearch(R10, 1, 10)
+    assert len(search.find(5, num=1000)) == len(search.values) * (len(search.values) + 1) // 2
+
+
+def test_find_accepts_numpy_integer_num():
+    np = pytest.importorskip("numpy")
+    assert len(find_combinations(R10, 4700, num=np.int64(2))) == 2
+
+
+def test_illegal_kind_raises_value_error():
+    with raises(ValueError):
+        find_combinations(R10, 100, kind='bridge')
+
+
+def test_illegal_num_raises_value_error():
+    with raises(ValueError):
+        find_combinations(R10, 100, num=0)
+
+
+def test_illegal_target_raises_value_error():
+    with raises(ValueError):
+        find_combinations(R10, -1)
+
+
+def test_empty_range_raises_value_error():
+    with raises(ValueError):
+        CombinationSearch(R10, 1.1, 1.2)
+
+
+def test_reversed_range_raises_value_error():
+    with raises(ValueError):
+        CombinationSearch(R10, 100, 10)
+
+
+def test_illegal_span_raises_value_error():
+    with raises(ValueError):
+        find_combinations(R10, 100, span=0.5)
+
+
+def test_search_series_key_and_repr():
+    search = CombinationSearch(R10, 10, 100)
+    assert search.series_key is R10
+    assert repr(search) == "CombinationSearch({!r}, 10.0, 100.0)".format(R10)
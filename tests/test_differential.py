@@ -0,0 +1,151 @@
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import sampled_from, floats, lists
+from pytest import raises
+
+np = pytest.importorskip("numpy")
+
+from renard import _reference, differential
+from renard.differential import (compare, decade_edge_values, engines, random_values, register_engine,
+                                 unregister_engine, run, OPERATIONS, ScalarEngine)
+from renard.renard import _MINIMUM_R_VALUE, RenardSeriesKey, R10, R80, find_nearest
+
+query_values = lists(floats(min_value=1e-200, max_value=1e300, allow_nan=False, allow_infinity=False),
+                     min_size=1, max_size=20)
+
+
+class OffByOneEngine(ScalarEngine):
+
+    def find_greater_than(self, series_key, values):
+        return [_reference.find_greater_than_or_equal(series_key, value) for value in values.tolist()]
+
+
+class PickyEngine:
+    """Implements only find_nearest, rejects a batch with any value above five, and accepts zero."""
+
+    def find_nearest(self, series_key, values):
+        if (values > 5).any():
+            raise ValueError("Too large")
+        return [0.0 if value == 0 else find_nearest(series_key, value) for value in values.tolist()]
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       values=query_values)
+def test_engines_agree_with_reference(series_key, values):
+    report = compare(values, series_keys=[series_key])
+    assert report.mismatches == []
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       value=floats(min_value=1e-30, max_value=1e30),
+       name=sampled_from(OPERATIONS))
+def test_reference_agrees_with_scalar(series_key, value, name):
+    assert getattr(_reference, name)(series_key, value) == getattr(ScalarEngine(), name)(series_key, np.array([value]))[0]
+
+
+@pytest.mark.parametrize("series_key", list(RenardSeriesKey))
+def test_engines_agree_with_reference_at_decade_edges(series_key):
+    values = decade_edge_values(series_key, decades=[-200, -1, 0, 307, 308])
+    report = compare(values, series_keys=[series_key])
+    assert report.mismatches == []
+
+
+def test_decade_edge_values_include_decade_boundary():
+    values = decade_edge_values(R80, decades=[0])
+    assert 9.75 in values
+    assert 10.0 in values
+    assert (9.75 + 10.0) / 2 in values
+    assert np.nextafter(10.0, 0.0) in values
+
+
+def test_decade_edge_values_include_minimum():
+    values = decade_edge_values(R10, decades=[0])
+    assert values[0] == _MINIMUM_R_VALUE
+    assert np.nextafter(_MINIMUM_R_VALUE, 1.0) in values
+
+
+def test_engines_reject_values_rejected_by_reference():
+    report = compare([0.0, -1.0, np.nextafter(_MINIMUM_R_VALUE, 0.0), np.inf, np.nan])
+    assert report.mismatches == []
+
+
+def test_mismatches_are_reported():
+    register_engine('off-by-one', OffByOneEngine())
+    try:
+        report = compare([1.0, 1.5], series_keys=[R10], engines=['off-by-one'])
+    finally:
+        unregister_engine('off-by-one')
+    assert not report.ok
+    assert [(m.operation, m.value, m.expected, m.actual) for m in report.mismatches] == [
+        ('find_greater_than', 1.0, 1.25, 1.0)]
+
+
+def test_speedups_are_reported():
+    report = compare(random_values(100, rng=42), series_keys=[R10], engines=['scalar'])
+    assert report.speedup('scalar') > 0
+    assert report.speedup('scalar', 'find_nearest') > 0
+    assert 'find_nearest' in str(report)
+
+
+def test_speedup_of_unknown_engine_raises_value_error():
+    report = compare([1.0], series_keys=[R10], engines=['scalar'])
+    with raises(ValueError):
+        report.speedup('abacus')
+
+
+def test_compare_unknown_engine_raises_value_error():
+    with raises(ValueError):
+        compare([1.0], engines=['abacus'])
+
+
+def test_compare_unknown_operation_raises_value_error():
+    with raises(ValueError):
+        compare([1.0], operations=['find_furthest'])
+
+
+def test_unregister_unknown_engine_raises_value_error():
+    with raises(ValueError):
+        unregister_engine('abacus')
+
+
+def test_scalar_engine_is_registered():
+    assert 'scalar' in engines()
+
+
+def test_run_finds_no_mismatches():
+    report = run(size=50, rng=0, decades=[0], series_keys=[R80], engines=['scalar'])
+    assert report.ok
+
+
+def test_rejected_batches_and_accepted_invalid_values_are_reported():
+    register_engine('picky', PickyEngine())
+    try:
+        report = compare([1.0, 10.0, 0.0], series_keys=[R10], engines=['picky'],
+                         operations=['find_nearest', 'find_greater_than'])
+    finally:
+        unregister_engine('picky')
+    assert [(m.operation, m.value, m.expected, m.actual) for m in report.mismatches] == [
+        ('find_nearest', 10.0, 10.0, ValueError),
+        ('find_nearest', 0.0, ValueError, 0.0)]
+    assert [(t.engine, t.operation) for t in report.timings] == [('picky', 'find_nearest')]
+    assert 'picky R10 find_nearest(10.0): expected 10.0' in str(report)
+
+
+def test_main_reports_mismatches(monkeypatch, capsys):
+    register_engine('off-by-one', OffByOneEngine())
+    try:
+        report = compare([1.0], series_keys=[R10], engines=['off-by-one'])
+    finally:
+        unregister_engine('off-by-one')
+    monkeypatch.setattr(differential, 'run', lambda: report)
+    assert differential.main() == 1
+    assert '1 mismatches' in capsys.readouterr().out
+
+
+def test_main_succeeds_without_mismatches(monkeypatch, capsys):
+    report = compare([1.0], series_keys=[R10], engines=['scalar'])
+    monkeypatch.setattr(differential, 'run', lambda: report)
+    assert differential.main() == 0
+    assert '0 mismatches' in capsys.readouterr().out
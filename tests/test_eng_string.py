@@ -1,7 +1,8 @@
 from hypothesis import given
-from hypothesis.strategies import integers, floats
+from hypothesis.strategies import integers, floats, sampled_from, booleans
 
 from renard.eng import eng_string
+from renard.renard import RenardSeriesKey, rrange
 
 
 def test_eng_string_zero():
@@ -35,4 +36,11 @@ def test_eng_string_kilo(x):
 
 @given(x=floats(min_value=1000000, max_value=999999999))
 def test_eng_string_mega(x):
-    assert eng_string(x, prefix=True).endswith(' M')
\ No newline at end of file
+    assert eng_string(x, prefix=True).endswith(' M')
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       low=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
+       prefix=booleans())
+def test_eng_string_renard_value_matches_float(series_key, low, prefix):
+    for value in rrange(series_key, low, low * 100, exact=True):
+        assert eng_string(value, prefix=prefix) == eng_string(float(value), prefix=prefix)
@@ -0,0 +1,123 @@
+import math
+
+import pytest
+from pytest import raises
+
+from renard import instrument
+from renard.cli import main
+from renard.eng import eng_string
+from renard.renard import R10, R20, find_nearest, find_nearest_few, find_greater_than, rrange
+
+
+@pytest.fixture
+def enabled():
+    instrument.reset()
+    instrument.enable()
+    yield
+    instrument.disable()
+    instrument.reset()
+
+
+def test_disabled_by_default_records_nothing():
+    instrument.reset()
+    find_nearest_few(R10, 42)
+    assert not instrument.is_enabled()
+    assert instrument.statistics() == {}
+
+
+def test_call_counts_are_recorded(enabled):
+    for value in (1, 2, 3):
+        find_nearest_few(R10, value)
+    stats = instrument.statistics()
+    assert stats['find_nearest_few'].calls == 3
+    assert stats['find_nearest_few'].total_time > 0
+
+
+def test_candidates_are_counted(enabled):
+    values = list(rrange(R10, 1, 10))
+    find_nearest_few(R10, 42, num=5)
+    stats = instrument.statistics()
+    assert stats['_rrange'].candidates == len(values)
+    assert stats['find_nearest_few'].candidates == 5
+
+
+def test_directional_finders_are_recorded(enabled):
+    find_greater_than(R20, 31)
+    stats = instrument.statistics()
+    assert stats['find_greater_than'].calls == 1
+
+
+def test_eng_string_is_recorded(enabled):
+    eng_string(3150)
+    assert instrument.statistics()['eng_string'].calls == 1
+
+
+def test_cli_handlers_are_recorded(enabled, capfd):
+    main("nearest R10 21".split())
+    capfd.readouterr()
+    assert instrument.statistics()['handle_nearest'].calls == 1
+
+
+def test_percentiles_are_ordered(enabled):
+    for value in range(1, 100):
+        find_nearest_few(R10, value)
+    stats = instrument.statistics()['find_nearest_few']
+    assert 0 < stats.percentile(50) <= stats.percentile(99) <= stats.percentile(100)
+    assert stats.percentile(100) >= stats.mean_time
+
+
+def test_percentile_out_of_range_raises_value_error(enabled):
+    find_nearest_few(R10, 42)
+    with raises(ValueError):
+        instrument.statistics()['find_nearest_few'].percentile(101)
+
+
+def test_hooks_receive_measurements(enabled):
+    samples = []
+
+    def hook(name, elapsed, candidates):
+        samples.append((name, elapsed, candidates))
+
+    instrument.add_hook(hook)
+    try:
+        list(rrange(R10, 1, 10))
+    finally:
+        instrument.remove_hook(hook)
+    assert [(name, candidates) for name, _, candidates in samples] == [('_rrange', 11)]
+    assert samples[0][1] >= 0
+
+
+def test_failing_hook_warns_without_breaking_lookups(enabled):
+    def hook(name, elapsed, candidates):
+        raise RuntimeError("exporter unavailable")
+
+    instrument.add_hook(hook)
+    try:
+        with pytest.warns(RuntimeWarning):
+            assert find_nearest(R10, 21) == 20.0
+        with pytest.warns(RuntimeWarning), raises(ValueError):
+            find_nearest(R10, math.inf)
+    finally:
+        instrument.remove_hook(hook)
+
+
+def test_stats_without_calls():
+    stats = instrument.FunctionStats('unused')
+    assert stats.percentile(50) == 0.0
+    assert stats.mean_time == 0.0
+    assert repr(stats) == "FunctionStats(name='unused', calls=0, total_time=0.0, candidates=0)"
+
+
+def test_statistics_are_a_snapshot(enabled):
+    find_nearest_few(R10, 42)
+    snapshot = instrument.statistics()['find_nearest_few']
+    percentile = snapshot.percentile(100)
+    for value in range(1, 100):
+        find_nearest_few(R10, value)
+    assert snapshot.calls == 1
+    assert snapshot.percentile(100) == percentile
+    snapshot.calls = 0
+    snapshot._histogram.clear()
+    stats = instrument.statistics()['find_nearest_few']
+    assert stats.calls == 100
+    assert stats.percentile(100) >= percentile
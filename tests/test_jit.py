@@ -0,0 +1,83 @@
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import sampled_from, floats, lists
+from pytest import raises
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("numba")
+
+from renard import vectorized
+from renard.renard import RenardSeriesKey, R20
+from renard.jit import nearest_index, count_range
+
+query_values = lists(floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
+                     min_size=1, max_size=20)
+
+FINDERS = ('find_nearest', 'find_greater_than_or_equal', 'find_greater_than',
+           'find_less_than_or_equal', 'find_less_than', 'find_nearest_step')
+
+
+def _on_backend(name, func, *args):
+    previous = vectorized.get_backend()
+    vectorized.set_backend(name)
+    try:
+        return func(*args)
+    finally:
+        vectorized.set_backend(previous)
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       values=query_values,
+       name=sampled_from(FINDERS))
+def test_backends_give_identical_results(series_key, values, name):
+    func = getattr(vectorized, name)
+    numpy_result = _on_backend('numpy', func, series_key, values)
+    numba_result = _on_backend('numba', func, series_key, values)
+    assert numpy_result.tolist() == numba_result.tolist()
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       starts=query_values,
+       stops=query_values)
+def test_backends_give_identical_counts(series_key, starts, stops):
+    size = min(len(starts), len(stops))
+    low = np.minimum(starts[:size], stops[:size])
+    high = np.maximum(starts[:size], stops[:size])
+    numpy_result = _on_backend('numpy', vectorized.count_rrange, series_key, low, high)
+    numba_result = _on_backend('numba', vectorized.count_rrange, series_key, low, high)
+    assert numpy_result.tolist() == numba_result.tolist()
+
+
+@pytest.mark.parametrize("name", ['numpy', 'numba'])
+def test_backends_raise_value_error_out_of_range(name):
+    with raises(ValueError):
+        _on_backend(name, vectorized.find_less_than, R20, [1e-300])
+
+
+def test_scalar_kernels_can_be_called_directly():
+    table = vectorized.series_table(R20)
+    assert table[nearest_index(table, 319.0)] == 315.0
+    assert count_range(table, 1.0, 10.0) == 21
+
+
+def test_nearest_index_beyond_table():
+    table = np.array([1.0, 2.0])
+    assert nearest_index(table, 0.5) == -1
+    assert nearest_index(table, 3.0) == 2
+
+
+def test_unknown_backend_raises_value_error():
+    with raises(ValueError):
+        vectorized.set_backend('fortran')
+
+
+def test_numba_is_the_default_backend_when_installed():
+    previous = vectorized.get_backend()
+    vectorized.set_backend()
+    try:
+        assert vectorized.get_backend() == 'numba'
+        assert set(vectorized.available_backends()) == {'numpy', 'numba'}
+    finally:
+        vectorized.set_backend(previous)
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import sampled_from, floats, lists, integers
+from pytest import raises
+
+np = pytest.importorskip("numpy")
+
+from renard import parallel, vectorized
+from renard.renard import RenardSeriesKey, R10, register_series, series_keys, unregister_series
+from renard.tables import compiled_table
+
+FINDERS = ('find_nearest', 'find_greater_than_or_equal', 'find_greater_than',
+           'find_less_than_or_equal', 'find_less_than', 'find_nearest_step')
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       values=lists(floats(min_value=1e-35, max_value=1e35), min_size=1, max_size=50),
+       chunk_size=integers(min_value=1, max_value=8),
+       name=sampled_from(FINDERS))
+def test_parallel_matches_vectorized(series_key, values, chunk_size, name):
+    result = getattr(parallel, name)(series_key, values, chunk_size=chunk_size)
+    assert result.tolist() == getattr(vectorized, name)(series_key, values).tolist()
+
+
+def test_parallel_with_given_executor_preserves_shape():
+    values = [[21, 31], [41, 51]]
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = parallel.find_nearest(R10, values, executor=executor, chunk_size=1)
+    assert result.tolist() == [[20.0, 31.5], [40.0, 50.0]]
+
+
+def test_parallel_out_of_range_raises_value_error():
+    with raises(ValueError):
+        parallel.find_less_than(R10, [1.0, 2.0, 3.0, 1e-300], chunk_size=1)
+
+
+def test_parallel_illegal_series_key_raises_value_error():
+    with raises(ValueError):
+        parallel.find_nearest(13, [1.0, 2.0], chunk_size=1)
+
+
+def test_parallel_chunk_size_not_positive_raises_value_error():
+    with raises(ValueError):
+        parallel.find_nearest(R10, [1.0], chunk_size=0)
+
+
+def test_concurrent_first_use_compiles_table_once():
+    series_key = register_series('PARALLEL-E3', (1.0, 2.2, 4.7), 0.1)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            tables = list(executor.map(lambda _: compiled_table(series_key), range(8)))
+        assert all(table is tables[0] for table in tables)
+    finally:
+        unregister_series(series_key)
+
+
+def test_concurrent_registration_and_iteration_of_series_keys():
+    registered = []
+
+    def register(i):
+        registered.append(register_series('PARALLEL-T{}'.format(i), (1.0, 5.0), 1.0))
+
+    def iterate(_):
+        return len(list(series_keys()))
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = ([executor.submit(register, i) for i in range(50)]
+                       + [executor.submit(iterate, i) for i in range(50)])
+            for future in futures:
+                future.result()
+        assert len(registered) == 50
+    finally:
+        for series_key in registered:
+            unregister_series(series_key)
+
+
+def test_benchmark_reports_scaling():
+    results = parallel.benchmark(R10, size=1000, max_threads=3, repeat=1, rng=0)
+    assert [result.threads for result in results] == [1, 2, 3]
+    assert results[0].speedup == 1.0
+    assert all(result.seconds > 0 for result in results)
+
+
+def test_main_prints_scaling(monkeypatch, capsys):
+    monkeypatch.setattr(parallel, 'benchmark', lambda: [parallel.ScalingResult(1, 0.5, 1.0),
+                                                        parallel.ScalingResult(2, 0.25, 2.0)])
+    assert parallel.main() == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].startswith("Backend ")
+    assert lines[2:] == ["      1     0.5000    1.00x", "      2     0.2500    2.00x"]
@@ -1,11 +1,18 @@
 import math
+import pickle
+from fractions import Fraction
+
+import pytest
 from hypothesis import given, assume
 from hypothesis.strategies import sampled_from, floats, data, integers
 from pytest import raises
 
 from renard.renard import (RenardSeriesKey, series, rrange, find_less_than_or_equal, find_greater_than_or_equal,
                            find_nearest,
-                           find_less_than, find_greater_than, find_nearest_few, open_rrange, R10, precision)
+                           find_less_than, find_greater_than, find_nearest_few, open_rrange, R10, precision,
+                           RenardCursor, RenardValue, RenardValueArray, register_series, unregister_series,
+                           series_key_from_name,
+                           series_keys, R5)
 
 
 @given(series_key=sampled_from(RenardSeriesKey))
@@ -115,20 +122,58 @@ def test_nearest_returns_value_from_series(data):
 
 @given(series_key=sampled_from(RenardSeriesKey),
        value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
-       num=sampled_from((1, 2, 3)))
+       num=integers(min_value=1, max_value=50))
 def test_find_nearest_few_has_correct_cardinality(series_key, value, num):
     assert len(find_nearest_few(series_key, value, num)) == num
 
 
 @given(series_key=sampled_from(RenardSeriesKey),
        value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
-       num=integers())
+       num=integers(max_value=0))
 def test_find_nearest_few_raises_error_with_num_out_of_range(series_key, value, num):
-    assume(num not in {1, 2, 3})
     with raises(ValueError):
         find_nearest_few(series_key, value, num)
 
 
+def test_find_nearest_few_raises_error_with_unknown_order():
+    with raises(ValueError):
+        find_nearest_few(R10, 42, 3, order='random')
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
+       num=integers(min_value=1, max_value=20))
+def test_find_nearest_few_are_the_nearest(series_key, value, num):
+    nearest = find_nearest_few(series_key, value, num)
+    # Excludes windows which may have been moved to straddle value
+    assume(num < 3 or (min(nearest) < value < max(nearest) and value not in nearest))
+    low = min(value / 10, nearest[0])
+    high = max(value * 10, nearest[-1])
+    others = set(rrange(series_key, low, high)) - set(nearest)
+    furthest = max(abs(v - value) for v in nearest)
+    assert all(abs(v - value) >= furthest for v in others)
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
+       num=integers(min_value=1, max_value=20))
+def test_find_nearest_few_ordered_by_distance(series_key, value, num):
+    by_value = find_nearest_few(series_key, value, num)
+    by_distance = find_nearest_few(series_key, value, num, order='distance')
+    assert sorted(by_distance) == list(by_value)
+    distances = [abs(v - value) for v in by_distance]
+    assert distances == sorted(distances)
+
+
+def test_greater_than_and_less_than_value_in_series():
+    assert find_greater_than(RenardSeriesKey.RR40, 11.0) == 12.0
+    assert find_less_than(RenardSeriesKey.RR40, 0.024) == 0.022
+
+
+def test_find_nearest_few_value_in_series_includes_neighbours():
+    assert find_nearest_few(RenardSeriesKey.RRR20, 1.2) == (1.1, 1.2, 1.4)
+
+
 @given(series_key=sampled_from(RenardSeriesKey),
        value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
 def test_find_nearest_three_includes_at_least_one_less(series_key, value):
@@ -141,6 +186,64 @@ def test_find_nearest_three_includes_at_least_one_greater(series_key, value):
     assert any(v > value for v in find_nearest_few(series_key, value))
 
 
+@given(series_key=sampled_from(RenardSeriesKey),
+       low=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
+       high=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
+def test_rrange_reverse_is_reversed_rrange(series_key, low, high):
+    assume(low <= high)
+    assume(high / low < 1e6)
+    assert list(rrange(series_key, low, high, reverse=True)) == list(reversed(list(rrange(series_key, low, high))))
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       low=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
+       high=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
+def test_open_rrange_reverse_is_reversed_open_rrange(series_key, low, high):
+    assume(low <= high)
+    assume(high / low < 1e6)
+    assert (list(open_rrange(series_key, low, high, reverse=True))
+            == list(reversed(list(open_rrange(series_key, low, high)))))
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
+def test_cursor_starts_at_greater_than_or_equal(series_key, value):
+    assert RenardCursor(series_key, value).value == find_greater_than_or_equal(series_key, value)
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
+def test_cursor_steps_through_rrange(series_key, value):
+    cursor = RenardCursor(series_key, value)
+    start = cursor.value
+    upwards = [start] + [cursor.up() for _ in range(2 * series_key.cardinality)]
+    assert upwards == list(rrange(series_key, start, upwards[-1]))
+    downwards = [cursor.value] + [cursor.down() for _ in range(2 * series_key.cardinality)]
+    assert downwards == upwards[::-1]
+
+
+def test_cursor_step_index():
+    cursor = RenardCursor(R10, 31)
+    assert cursor.step == 15
+    cursor.down()
+    assert cursor.step == 14
+
+
+def test_cursor_series_key_and_repr():
+    cursor = RenardCursor(R10, 31)
+    assert cursor.series_key is R10
+    assert repr(cursor) == "RenardCursor({!r}, 31.5)".format(R10)
+
+
+def test_cursor_beyond_range_raises_value_error():
+    cursor = RenardCursor(R10, 1.3e-199)
+    while cursor.value > 1e-200:
+        cursor.down()
+    with raises(ValueError):
+        cursor.down()
+    assert cursor.value == 1e-200
+
+
 def test_erange_start_infinite_raises_value_error():
     with raises(ValueError):
         inf = float("inf")
@@ -208,3 +311,233 @@ def test_illegal_precision_series_key_raises_value_error():
         precision(object())
 
 
+
+
+@pytest.fixture(scope='module')
+def e12():
+    series_key = register_series('E12', (1.0, 1.2, 1.5, 1.8, 2.2, 2.7, 3.3, 3.9, 4.7, 5.6, 6.8, 8.2), 0.1)
+    yield series_key
+    unregister_series(series_key)
+
+
+def test_registered_series_is_available_by_name(e12):
+    assert series_key_from_name('E12') is e12
+    assert e12 in series_keys()
+    assert e12.cardinality == 12
+    assert precision(e12) == 0.1
+
+
+def test_registered_series_key_can_be_pickled(e12):
+    assert pickle.loads(pickle.dumps(e12)) is e12
+
+
+def test_registered_series_rrange(e12):
+    assert list(rrange(e12, 300, 1000)) == [330.0, 390.0, 470.0, 560.0, 680.0, 820.0, 1000.0]
+
+
+@given(value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
+def test_registered_series_nearest_is_nearest(e12, value):
+    nearest = find_nearest(e12, value)
+    lower = find_less_than_or_equal(e12, value)
+    upper = find_greater_than_or_equal(e12, value)
+    assert lower <= value <= upper
+    assert nearest in (lower, upper)
+    assert abs(nearest - value) <= min(value - lower, upper - value)
+
+
+@given(value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
+def test_registered_series_cursor(e12, value):
+    cursor = RenardCursor(e12, value)
+    lower = cursor.down()
+    assert lower == find_less_than(e12, cursor.up())
+
+
+def test_nearest_few_window_is_moved_down_to_straddle_value():
+    # The values just above 1.0 are much closer than the value below it
+    series_key = register_series('TIGHT', (1.0, 1.01, 1.02), 0.01)
+    try:
+        assert find_nearest_few(series_key, 1.0) == (0.102, 1.0, 1.01)
+    finally:
+        unregister_series(series_key)
+
+
+def test_unregistered_series_is_unavailable_and_its_name_reusable():
+    series_key = register_series('E3', (1.0, 2.2, 4.7), 0.1)
+    assert find_nearest(series_key, 2.0) == 2.2
+    unregister_series(series_key)
+    assert series_key not in series_keys()
+    with raises(ValueError):
+        series_key_from_name('E3')
+    with raises(ValueError):
+        find_nearest(series_key, 2.0)
+    series_key = register_series('E3', (1.0, 2.2, 4.7), 0.1)
+    unregister_series(series_key)
+
+
+def test_unregister_series_twice_raises_value_error():
+    series_key = register_series('E3', (1.0, 2.2, 4.7), 0.1)
+    unregister_series(series_key)
+    with raises(ValueError):
+        unregister_series(series_key)
+
+
+def test_unregister_built_in_series_raises_value_error():
+    with raises(ValueError):
+        unregister_series(R10)
+
+
+@pytest.mark.parametrize("name", ['', None, 12])
+def test_register_series_invalid_name_raises_value_error(name):
+    with raises(ValueError):
+        register_series(name, (1.0, 2.0, 5.0), 1)
+
+
+def test_register_series_duplicate_name_raises_value_error():
+    with raises(ValueError):
+        register_series('R10', (1.0, 2.0, 5.0), 1)
+
+
+@pytest.mark.parametrize("base_values, series_precision", [
+    ((), 0.1),
+    ((1.0,), 0.1),
+    ((1.5, 2.0), 0.1),
+    ((1.0, 10.0), 0.1),
+    ((1.0, 3.0, 2.0), 0.1),
+    ((1.0, 2.0), 0),
+    ((1.0, 2.0), 2),
+    ((1.0, 2.25), 0.1),
+    ((1.0, 1.25, 2.5, 5.0), 0.25),
+])
+def test_register_series_invalid_values_raises_value_error(base_values, series_precision):
+    with raises(ValueError):
+        register_series('BOGUS', base_values, series_precision)
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
+       finder=sampled_from([find_nearest, find_greater_than_or_equal, find_greater_than,
+                            find_less_than_or_equal, find_less_than]))
+def test_exact_lookup_converts_to_float_lookup(series_key, value, finder):
+    assert float(finder(series_key, value, exact=True)) == finder(series_key, value)
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
+       num=integers(min_value=1, max_value=10),
+       order=sampled_from(['value', 'distance']))
+def test_exact_find_nearest_few_converts_to_float(series_key, value, num, order):
+    exact = find_nearest_few(series_key, value, num, order, exact=True)
+    assert tuple(map(float, exact)) == find_nearest_few(series_key, value, num, order)
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       low=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
+def test_exact_rrange_converts_to_float_rrange(series_key, low):
+    high = low * 1000
+    assert list(map(float, rrange(series_key, low, high, exact=True))) == list(rrange(series_key, low, high))
+    assert list(rrange(series_key, low, high, reverse=True, exact=True)) == list(
+        reversed(list(rrange(series_key, low, high, exact=True))))
+
+
+def test_renard_value_digits():
+    value = find_nearest(R10, 3.2, exact=True)
+    assert (value.mantissa, value.exponent) == (315, -2)
+    assert str(value) == '3.15'
+    assert repr(value) == "RenardValue(R10, '3.15')"
+
+
+def test_renard_value_trailing_zeros_are_normalized():
+    value = find_nearest(R10, 2e6, exact=True)
+    assert (value.mantissa, value.exponent) == (2, 6)
+    assert value == RenardValue(R10, 2000, 3)
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
+def test_renard_value_stepping(series_key, value):
+    exact = find_nearest(series_key, value, exact=True)
+    assert float(exact.next()) == find_greater_than(series_key, float(exact))
+    assert float(exact.previous()) == find_less_than(series_key, float(exact))
+    assert exact.next(3).previous(3) == exact
+
+
+def test_renard_value_steps_across_decades():
+    assert str(find_nearest(R10, 8.0, exact=True).next()) == '1E+1'
+    assert str(find_nearest(R10, 10.0, exact=True).previous()) == '8'
+
+
+def test_renard_value_step_out_of_range_raises_value_error():
+    with raises(ValueError):
+        find_nearest(R10, 1e-200, exact=True).previous()
+    with raises(ValueError):
+        find_nearest(R10, 1.6e308, exact=True).next()
+
+
+def test_renard_value_comparison_is_exact():
+    value = find_nearest(R10, 3.2, exact=True)
+    assert value != 3.15
+    assert value == Fraction(315, 100)
+    assert value < value.next()
+    assert value > 3
+    assert value <= Fraction(63, 20)
+    assert find_nearest(R10, 2000, exact=True) == 2000
+
+
+def test_renard_value_comparison_with_other_types():
+    value = find_nearest(R10, 3.2, exact=True)
+    assert value >= 3.15
+    assert value >= Fraction(3)
+    assert value != '3.15'
+    with raises(TypeError):
+        value < '3.15'
+
+
+def test_renard_value_not_in_series_has_no_step():
+    with raises(ValueError):
+        RenardValue(R10, 3, 0).step
+
+
+def test_renard_value_equal_values_from_different_series_are_equal():
+    r5 = find_nearest(R5, 1.6, exact=True)
+    r10 = find_nearest(R10, 1.6, exact=True)
+    assert r5 == r10
+    assert hash(r5) == hash(r10)
+    assert r5.step != r10.step
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       value=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
+def test_renard_value_hash_is_numeric(series_key, value):
+    exact = find_nearest(series_key, value, exact=True)
+    assert hash(exact) == hash(Fraction(exact.mantissa) * Fraction(10) ** exact.exponent)
+
+
+def test_renard_value_pickle_round_trip(e12):
+    value = find_nearest(e12, 3300, exact=True)
+    assert pickle.loads(pickle.dumps(value)) == value
+
+
+def test_renard_value_array_from_range():
+    packed = RenardValueArray.from_range(R10, 1700, 3400)
+    assert len(packed) == 3
+    assert packed.series_key is R10
+    assert packed[0] == find_nearest(R10, 2000, exact=True)
+    assert packed != packed.steps
+    assert repr(packed) == "RenardValueArray(R10, [33, 34, 35])"
+    assert list(packed.floats()) == list(rrange(R10, 1700, 3400))
+    assert list(packed) == list(rrange(R10, 1700, 3400, exact=True))
+    assert packed[1:].steps.tolist() == packed.steps.tolist()[1:]
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       low=floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False))
+def test_renard_value_array_from_values_round_trip(series_key, low):
+    values = list(rrange(series_key, low, low * 100, exact=True))
+    packed = RenardValueArray.from_values(series_key, values)
+    assert list(packed) == values
+    assert packed == RenardValueArray.from_range(series_key, low, low * 100)
+
+
+def test_renard_value_array_from_values_of_other_series_raises_value_error():
+    with raises(ValueError):
+        RenardValueArray.from_values(R10, [find_nearest(R5, 1.6, exact=True)])
@@ -0,0 +1,99 @@
+import math
+from collections import Counter
+
+import pytest
+from hypothesis import given, assume, settings
+from hypothesis.strategies import sampled_from, floats, integers
+from pytest import raises
+
+np = pytest.importorskip("numpy")
+
+from renard.renard import RenardSeriesKey, R5, R10, RRR10, rrange
+from renard.sampling import sample
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       low=floats(min_value=1e-35, max_value=1e35),
+       decades=floats(min_value=0.1, max_value=5),
+       seed=integers(min_value=0),
+       distribution=sampled_from(('uniform', 'log-uniform')))
+def test_samples_are_values_in_range(series_key, low, decades, seed, distribution):
+    high = low * 10 ** decades
+    values = set(rrange(series_key, low, high))
+    assume(values)
+    samples = sample(series_key, low, high, 100, rng=seed, distribution=distribution)
+    assert set(samples.tolist()) <= values
+
+
+def test_samples_have_requested_shape():
+    assert sample(R10, 1, 1000, (3, 4), rng=0).shape == (3, 4)
+
+
+def test_samples_are_reproducible_with_a_seed():
+    assert sample(R10, 1, 1000, 50, rng=42).tolist() == sample(R10, 1, 1000, 50, rng=42).tolist()
+
+
+def test_uniform_samples_cover_the_range():
+    samples = sample(R5, 1, 1000, 20000, rng=1)
+    counts = Counter(samples.tolist())
+    assert set(counts) == set(rrange(R5, 1, 1000))
+    assert min(counts.values()) > 20000 / 16 * 0.8
+
+
+def test_log_uniform_samples_are_proportional_to_logarithmic_intervals():
+    samples = sample(RRR10, 1.2, 3.0, 50000, rng=2, distribution='log-uniform')
+    counts = Counter(samples.tolist())
+    neighbours = list(rrange(RRR10, 1.0, 4.0))
+    expected = {value: math.log10(above / below) / 2
+                for below, value, above in zip(neighbours, neighbours[1:], neighbours[2:])}
+    total = sum(expected.values())
+    for value, width in expected.items():
+        assert counts[value] / 50000 == pytest.approx(width / total, abs=0.01)
+
+
+def test_weighted_samples_follow_weights():
+    samples = sample(R5, 1, 1e6, 10000, rng=3, weights=[1, 0, 0, 0, 1])
+    assert set(samples.tolist()) <= {1.0, 6.3, 10.0, 63.0, 100.0, 630.0, 1e3, 6.3e3, 1e4, 6.3e4, 1e5, 6.3e5, 1e6}
+
+
+def test_weights_with_log_uniform_raises_value_error():
+    with raises(ValueError):
+        sample(R5, 1, 10, 1, distribution='log-uniform', weights=[1, 1, 1, 1, 1])
+
+
+def test_wrong_number_of_weights_raises_value_error():
+    with raises(ValueError):
+        sample(R5, 1, 10, 1, weights=[1, 1])
+
+
+def test_zero_weights_raises_value_error():
+    with raises(ValueError):
+        sample(R5, 1, 1.5, 1, weights=[0, 1, 1, 1, 1])
+
+
+def test_empty_range_raises_value_error():
+    with raises(ValueError):
+        sample(R5, 1.1, 1.5, 1)
+
+
+def test_unknown_distribution_raises_value_error():
+    with raises(ValueError):
+        sample(R5, 1, 10, 1, distribution='normal')
+
+
+def test_start_stop_in_wrong_order_raises_value_error():
+    with raises(ValueError):
+        sample(R5, 10, 1, 1)
+
+
+@pytest.mark.parametrize("weights", [[-1, 1, 1, 1, 1], [math.nan, 1, 1, 1, 1], [math.inf, 1, 1, 1, 1]])
+def test_negative_or_non_finite_weights_raise_value_error(weights):
+    with raises(ValueError):
+        sample(R5, 1, 10, 1, weights=weights)
+
+
+@pytest.mark.parametrize("start, stop", [(math.inf, 10), (1, math.inf), (math.nan, 10), (1, math.nan)])
+def test_non_finite_start_or_stop_raises_value_error(start, stop):
+    with raises(ValueError):
+        sample(R5, start, stop, 1)
@@ -0,0 +1,43 @@
+from itertools import count, islice
+
+import pytest
+from hypothesis import given, settings
+from hypothesis.strategies import sampled_from, floats, lists, integers
+from pytest import raises
+
+pytest.importorskip("numpy")
+
+from renard import renard
+from renard.renard import RenardSeriesKey, R20
+from renard.stream import (nearest_iter, greater_than_or_equal_iter, greater_than_iter,
+                           less_than_or_equal_iter, less_than_iter)
+
+ITERATORS = {
+    nearest_iter: renard.find_nearest,
+    greater_than_or_equal_iter: renard.find_greater_than_or_equal,
+    greater_than_iter: renard.find_greater_than,
+    less_than_or_equal_iter: renard.find_less_than_or_equal,
+    less_than_iter: renard.find_less_than,
+}
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       values=lists(floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
+                    max_size=50),
+       chunk_size=integers(min_value=1, max_value=16),
+       iterator=sampled_from(list(ITERATORS)))
+def test_iterators_match_scalar_in_order(series_key, values, chunk_size, iterator):
+    scalar = ITERATORS[iterator]
+    results = list(iterator(series_key, iter(values), chunk_size=chunk_size))
+    assert results == [scalar(series_key, value) for value in values]
+
+
+def test_nearest_iter_consumes_unbounded_iterable_lazily():
+    results = nearest_iter(R20, count(start=1), chunk_size=8)
+    assert list(islice(results, 3)) == [1.0, 2.0, 3.15]
+
+
+def test_nearest_iter_non_positive_chunk_size_raises_value_error():
+    with raises(ValueError):
+        nearest_iter(R20, [1.0], chunk_size=0)
@@ -0,0 +1,139 @@
+import struct
+
+from hypothesis import given
+from hypothesis.strategies import sampled_from, integers
+from pytest import raises
+
+from renard.renard import RenardSeriesKey, R5, R10, R80, rrange
+from renard.tables import (CompiledTable, compile_table, compiled_table, save_tables, load_tables,
+                           DEFAULT_START_DECADE, DEFAULT_STOP_DECADE)
+
+
+@given(series_key=sampled_from(RenardSeriesKey),
+       decade=integers(min_value=-30, max_value=30))
+def test_compiled_table_matches_rrange(series_key, decade):
+    table = compile_table(series_key, decade, decade + 1)
+    start = table.values[0]
+    stop = table.values[-1]
+    assert tuple(table.values) == tuple(rrange(series_key, start, stop))
+
+
+def test_compiled_table_step_addressing():
+    table = compile_table(R10, -2, 2)
+    assert table.first_step == -20
+    assert table.last_step == 29
+    assert table.value(0) == 1.0
+    assert table.value(10) == 10.0
+    assert table.value(-1) == 0.8
+
+
+def test_compiled_table_step_out_of_range_raises_value_error():
+    table = compile_table(R10, -2, 2)
+    with raises(ValueError):
+        table.value(30)
+
+
+def test_compile_table_decades_in_wrong_order_raises_value_error():
+    with raises(ValueError):
+        compile_table(R10, 3, 2)
+
+
+def test_compile_table_decades_out_of_range_raises_value_error():
+    with raises(ValueError):
+        compile_table(R10, DEFAULT_START_DECADE - 1, 0)
+
+
+def test_compiled_table_spans_full_range():
+    table = compiled_table(R80)
+    assert table.start_decade == DEFAULT_START_DECADE
+    assert table.stop_decade == DEFAULT_STOP_DECADE
+    assert table is compiled_table(R80)
+
+
+def test_save_and_load_tables_round_trip(tmp_path):
+    path = tmp_path / "tables.bin"
+    tables = [compile_table(R5, -3, 3), compile_table(R80, 0, 5)]
+    save_tables(path, tables)
+    loaded = load_tables(path)
+    try:
+        assert set(loaded) == {R5, R80}
+        for table in tables:
+            restored = loaded[table.series_key]
+            assert restored.start_decade == table.start_decade
+            assert restored.stop_decade == table.stop_decade
+            assert restored.geometric_scale == table.geometric_scale
+            assert tuple(restored.log10_mantissa) == tuple(table.log10_mantissa)
+            assert tuple(restored.values) == tuple(table.values)
+        assert compiled_table(R5) is not loaded[R5]
+        assert compiled_table(R5).start_decade == DEFAULT_START_DECADE
+    finally:
+        from renard import tables as tables_module
+        tables_module._tables.pop(R5, None)
+        tables_module._tables.pop(R80, None)
+
+
+def test_load_tables_installs_only_complete_tables(tmp_path):
+    path = tmp_path / "tables.bin"
+    save_tables(path, [compile_table(R5), compile_table(R10, -3, 3)])
+    loaded = load_tables(path)
+    try:
+        assert compiled_table(R5) is loaded[R5]
+        assert compiled_table(R10) is not loaded[R10]
+        assert compiled_table(R10).stop_decade == DEFAULT_STOP_DECADE
+    finally:
+        from renard import tables as tables_module
+        tables_module._tables.pop(R5, None)
+        tables_module._tables.pop(R10, None)
+
+
+def test_load_tables_rejects_other_files(tmp_path):
+    path = tmp_path / "bogus.bin"
+    path.write_bytes(b"not a snapshot at all, honestly")
+    with raises(ValueError):
+        load_tables(path)
+
+
+def test_load_tables_rejects_other_byte_order(tmp_path):
+    path = tmp_path / "tables.bin"
+    save_tables(path, [compile_table(R5, -3, 3)])
+    snapshot = bytearray(path.read_bytes())
+    # Reverse the byte order mark, as written on a platform with the other byte order
+    snapshot[12:16] = snapshot[12:16][::-1]
+    path.write_bytes(bytes(snapshot))
+    with raises(ValueError):
+        load_tables(path)
+
+
+def test_compiled_table_length_and_repr():
+    table = compile_table(R10, -2, 2)
+    assert len(table) == 50
+    assert repr(table) == "CompiledTable(series_key={!r}, start_decade=-2, stop_decade=2)".format(R10)
+
+
+def test_compiled_table_wrong_mantissa_length_raises_value_error():
+    table = compile_table(R10, 0, 1)
+    with raises(ValueError):
+        CompiledTable(R10, 0, 1, table.log10_mantissa[1:], table.geometric_scale, table.values)
+
+
+def test_compiled_table_wrong_values_length_raises_value_error():
+    table = compile_table(R10, 0, 1)
+    with raises(ValueError):
+        CompiledTable(R10, 0, 2, table.log10_mantissa, table.geometric_scale, table.values)
+
+
+def test_load_tables_rejects_truncated_file(tmp_path):
+    path = tmp_path / "short.bin"
+    path.write_bytes(b"RNRDTBL")
+    with raises(ValueError):
+        load_tables(path)
+
+
+def test_load_tables_rejects_other_version(tmp_path):
+    path = tmp_path / "tables.bin"
+    save_tables(path, [compile_table(R5, -3, 3)])
+    snapshot = bytearray(path.read_bytes())
+    snapshot[8:12] = struct.pack('=I', 99)
+    path.write_bytes(bytes(snapshot))
+    with raises(ValueError):
+        load_tables(path)
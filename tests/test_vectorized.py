@@ -0,0 +1,198 @@
+import sys
+
+import pytest
+from hypothesis import given, settings, assume
+from hypothesis.strategies import sampled_from, floats, lists, data, integers, one_of
+from pytest import raises
+
+np = pytest.importorskip("numpy")
+
+from renard import renard, vectorized
+from renard.renard import RenardSeriesKey, R10, series, register_series, unregister_series
+
+query_values = lists(floats(min_value=1e-35, max_value=1e35, allow_nan=False, allow_infinity=False),
+                     min_size=1, max_size=20)
+
+
+
+@pytest.fixture(scope='module')
+def e6():
+    series_key = register_series('E6', (1.0, 1.5, 2.2, 3.3, 4.7, 6.8), 0.1)
+    yield series_key
+    unregister_series(series_key)
+
+
+FINDERS = ('find_nearest', 'find_greater_than_or_equal', 'find_greater_than',
+           'find_less_than_or_equal', 'find_less_than')
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       values=query_values,
+       name=sampled_from(FINDERS))
+def test_vectorized_matches_scalar(series_key, values, name):
+    scalar = getattr(renard, name)
+    batched = getattr(vectorized, name)
+    assert batched(series_key, values).tolist() == [scalar(series_key, value) for value in values]
+
+
+@settings(deadline=None)
+@given(values=query_values,
+       name=sampled_from(FINDERS))
+def test_vectorized_registered_series_matches_scalar(e6, values, name):
+    scalar = getattr(renard, name)
+    batched = getattr(vectorized, name)
+    assert batched(e6, values).tolist() == [scalar(e6, value) for value in values]
+
+
+@settings(deadline=None)
+@given(data())
+def test_vectorized_series_values_are_fixed_points(data):
+    series_key = data.draw(sampled_from(RenardSeriesKey))
+    values = series(series_key)
+    assert vectorized.find_nearest(series_key, values).tolist() == list(values)
+    assert vectorized.find_less_than_or_equal(series_key, values).tolist() == list(values)
+    assert vectorized.find_greater_than_or_equal(series_key, values).tolist() == list(values)
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       values=query_values,
+       num=integers(min_value=1, max_value=20),
+       order=sampled_from(('value', 'distance')))
+def test_vectorized_find_nearest_few_matches_scalar(series_key, values, num, order):
+    expected = [list(renard.find_nearest_few(series_key, value, num, order)) for value in values]
+    assert vectorized.find_nearest_few(series_key, values, num, order).tolist() == expected
+
+
+def _outcome(func, *args):
+    try:
+        return func(*args)
+    except ValueError:
+        return ValueError
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       value=one_of(floats(min_value=1e-200, max_value=1e-198), floats(min_value=1e306, max_value=sys.float_info.max)),
+       num=integers(min_value=1, max_value=20),
+       order=sampled_from(('value', 'distance')))
+def test_vectorized_find_nearest_few_matches_scalar_at_ends_of_range(series_key, value, num, order):
+    expected = _outcome(lambda: list(renard.find_nearest_few(series_key, value, num, order)))
+    result = _outcome(lambda: vectorized.find_nearest_few(series_key, [value], num, order)[0].tolist())
+    assert result == expected
+
+
+def test_vectorized_find_nearest_few_invalid_num_raises_value_error():
+    with raises(ValueError):
+        vectorized.find_nearest_few(R10, [1.0], 0)
+
+
+def test_vectorized_find_nearest_few_invalid_order_raises_value_error():
+    with raises(ValueError):
+        vectorized.find_nearest_few(R10, [1.0], 3, order='random')
+
+
+def test_vectorized_steps_round_trip():
+    steps = vectorized.find_nearest_step(R10, [1.0, 21.0, 0.8])
+    assert steps.tolist() == [0, 13, -1]
+    assert vectorized.value_at_step(R10, steps).tolist() == [1.0, 20.0, 0.8]
+
+
+def test_vectorized_value_at_step_out_of_range_raises_value_error():
+    with raises(ValueError):
+        vectorized.value_at_step(R10, [10 ** 6])
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       low=floats(min_value=1e-35, max_value=1e35),
+       high=floats(min_value=1e-35, max_value=1e35))
+def test_vectorized_count_rrange_matches_rrange(series_key, low, high):
+    low, high = min(low, high), max(low, high)
+    assume(high / low < 1e6)
+    assert vectorized.count_rrange(series_key, low, high) == len(list(renard.rrange(series_key, low, high)))
+
+
+def test_vectorized_count_rrange_start_stop_in_wrong_order_raises_value_error():
+    with raises(ValueError):
+        vectorized.count_rrange(R10, [1.0, 10.0], [5.0, 8.0])
+
+
+def test_vectorized_preserves_shape():
+    result = vectorized.find_nearest(R10, [[21, 31], [41, 51]])
+    assert result.shape == (2, 2)
+    assert result.tolist() == [[20.0, 31.5], [40.0, 50.0]]
+
+
+def test_vectorized_non_finite_raises_value_error():
+    with raises(ValueError):
+        vectorized.find_nearest(R10, [1.0, float('nan')])
+
+
+def test_vectorized_out_of_range_raises_value_error():
+    with raises(ValueError):
+        vectorized.find_less_than(R10, [1.0, 1e-300])
+
+
+def test_vectorized_illegal_series_key_raises_value_error():
+    with raises(ValueError):
+        vectorized.find_nearest(13, [1.0])
+
+
+def test_vectorized_too_small_raises_value_error():
+    with raises(ValueError):
+        vectorized.find_greater_than_or_equal(R10, [1.0, 0.0])
+
+
+def test_vectorized_largest_values_match_scalar():
+    values = [9e307, 1.5e308]
+    assert vectorized.find_greater_than_or_equal(R10, values).tolist() == [1e308, 1.6e308]
+    assert vectorized.find_nearest(R10, [1.7e308]).tolist() == [renard.find_nearest(R10, 1.7e308)]
+
+
+def test_vectorized_too_large_to_represent_raises_value_error():
+    with raises(ValueError):
+        vectorized.find_greater_than_or_equal(R10, [1.7e308])
+
+
+@settings(deadline=None)
+@given(series_key=sampled_from(RenardSeriesKey),
+       values=lists(floats(min_value=1e-35, max_value=1e35), max_size=20),
+       rel_tol=floats(min_value=0.0, max_value=0.9))
+def test_vectorized_within_tolerance_matches_rrange(series_key, values, rel_tol):
+    found, offsets = vectorized.within_tolerance(series_key, values, rel_tol)
+    assert len(offsets) == len(values) + 1
+    assert offsets[-1] == len(found)
+    for i, value in enumerate(values):
+        expected = list(renard.rrange(series_key, value * (1 - rel_tol), value * (1 + rel_tol)))
+        assert found[offsets[i]:offsets[i + 1]].tolist() == expected
+
+
+def test_vectorized_within_tolerance_zero_finds_only_series_values():
+    found, offsets = vectorized.within_tolerance(R10, [2.5, 2.6], 0)
+    assert found.tolist() == [2.5]
+    assert offsets.tolist() == [0, 1, 1]
+
+
+def test_vectorized_within_tolerance_excludes_values_too_large_to_represent():
+    found, offsets = vectorized.within_tolerance(R10, [1.7e308], 0.5)
+    assert found.tolist() == [1e308, 1.25e308, 1.6e308]
+
+
+@pytest.mark.parametrize("rel_tol", [-0.1, 1.0, float('nan')])
+def test_vectorized_within_tolerance_invalid_tolerance_raises_value_error(rel_tol):
+    with raises(ValueError):
+        vectorized.within_tolerance(R10, [1.0], rel_tol)
+
+
+def test_numpy_backend_is_used_when_numba_is_unavailable(monkeypatch):
+    monkeypatch.setitem(vectorized._BACKEND_MODULES, 'numba', 'renard._no_such_module')
+    previous = vectorized.get_backend()
+    try:
+        vectorized.set_backend()
+        assert vectorized.get_backend() == 'numpy'
+        assert vectorized.available_backends() == ('numpy',)
+    finally:
+        monkeypatch.undo()
+        vectorized.set_backend(previous)